@@ -0,0 +1,61 @@
+"""
+Compare the thread-pool and asyncio fetch engines on a latency-injecting provider.
+
+    python benchmarks/bench_fetch_engines.py --tickers 500 --chunk-size 1 --concurrency 32
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from demand_zone.fetch import fetch_chunks_async, fetch_chunks_threaded
+from demand_zone.providers import LatencyProvider, SyntheticProvider
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--chunk-size', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--slow-rate', type=float, default=0.01)
+    parser.add_argument('--slow-latency', type=float, default=2.0)
+    parser.add_argument('--request-timeout', type=float, default=1.0)
+    parser.add_argument('--deadline', type=float, default=None)
+    args = parser.parse_args()
+
+    synthetic = SyntheticProvider(n_tickers=args.tickers, n_bars=63)
+    tickers = synthetic.fetch_universe()
+    chunks = [tickers[i:i + args.chunk_size] for i in range(0, len(tickers), args.chunk_size)]
+
+    engines = {
+        'threads': lambda fetch: fetch_chunks_threaded(chunks, fetch, max_workers=args.concurrency),
+        'asyncio': lambda fetch: fetch_chunks_async(
+            chunks, fetch,
+            concurrency=args.concurrency,
+            request_timeout=args.request_timeout,
+            deadline=args.deadline
+        ),
+    }
+
+    for name, run in engines.items():
+        provider = LatencyProvider(
+            synthetic,
+            latency=args.latency,
+            slow_rate=args.slow_rate,
+            slow_latency=args.slow_latency
+        )
+        start = time.perf_counter()
+        result = run(lambda chunk: provider.fetch_bars(chunk, period='3mo'))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:8s} {elapsed:7.2f} s  {len(result.bars):6d} tickers  "
+            f"{provider.requests:5d} requests  incomplete={result.incomplete} "
+            f"timed_out={len(result.timed_out)} missed_deadline={len(result.missed_deadline)}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Profile module import time with python -X importtime to catch cold-start regressions.
+
+    python benchmarks/bench_import_time.py --repeat 5 --top 10
+    python benchmarks/bench_import_time.py --module main --budget-ms 1500
+
+Each module is imported in a fresh interpreter from the repo root. Modules
+that must stay off the import path (e.g. Plotly for main, Streamlit for the
+CLI) are reported as violations, and --budget-ms fails the run when the
+median cumulative import time exceeds it.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Module -> top-level packages it must not import eagerly
+TARGETS = {
+    'main': ['plotly', 'yfinance', 'ta', 'requests'],
+    'demand_zone.cli': ['streamlit', 'plotly', 'yfinance', 'requests'],
+    'demand_zone.scan': ['streamlit', 'plotly', 'yfinance', 'requests'],
+}
+
+
+def profile_import(module):
+    """
+    Import module in a fresh interpreter and return {imported module:
+    (self_us, cumulative_us)} parsed from -X importtime
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--module', action='append', help="Module to profile (default: all targets)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help="Slowest imports to list per module")
+    parser.add_argument('--budget-ms', type=float, help="Fail if a module's median import time exceeds this")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    for module in args.module or list(TARGETS):
+        try:
+            runs = [profile_import(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module}: skipped ({e})")
+            continue
+
+        total_ms = statistics.median(run[module][1] for run in runs) / 1000
+        last = runs[-1]
+        slowest = sorted(
+            (name for name in last if name != module),
+            key=lambda name: last[name][1],
+            reverse=True
+        )[:args.top]
+        loaded = {name.split('.')[0] for name in last}
+        violations = sorted(loaded & set(TARGETS.get(module, [])))
+
+        print(f"{module}: {total_ms:8.1f} ms median over {args.repeat} runs")
+        for name in slowest:
+            print(f"    {last[name][1] / 1000:8.1f} ms  {name}")
+        if violations:
+            print(f"    eagerly imports: {', '.join(violations)}")
+
+        over_budget = args.budget_ms is not None and total_ms > args.budget_ms
+        failed = failed or over_budget or bool(violations)
+        results[module] = {
+            'median_ms': total_ms,
+            'runs_ms': [run[module][1] / 1000 for run in runs],
+            'slowest': {name: last[name][1] / 1000 for name in slowest},
+            'eager_imports': violations,
+            'over_budget': over_budget,
+        }
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
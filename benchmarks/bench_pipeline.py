@@ -0,0 +1,178 @@
+"""
+Benchmark the fetch -> indicators -> screen -> chart pipeline on synthetic data at increasing universe sizes.
+
+    python benchmarks/bench_pipeline.py --sizes 25 500 5000 50000 --latency 0.02 --missing-rate 0.01
+    python benchmarks/bench_pipeline.py --sizes 500 --per-ticker --output results.json
+
+Bars come from SyntheticProvider behind a LatencyProvider, so fetch timings
+include simulated network latency. Each size runs scan_stocks() and
+screen_stocks() as the app does, then draws --charts figures with
+main.plot_stock() (skipped when Streamlit or Plotly is not installed).
+Per-stage totals inside the scan come from its Timings. Each size is run
+again under tracemalloc for peak memory (skip with --no-memory). Results
+are written as JSON, by default to benchmarks/results/.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from demand_zone.providers import LatencyProvider, SyntheticProvider
+from demand_zone.scan import BATCH_CHUNK_SIZE, MAX_WORKERS, calculate_indicators, scan_stocks, screening_period
+from demand_zone.screen import screen_stocks
+from demand_zone.timing import Timings
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def load_plot_stock():
+    """
+    main.plot_stock and its chart period, or None when the app's
+    dependencies are not installed
+    """
+    try:
+        import main
+        import plotly  # noqa: F401
+    except ImportError as e:
+        print(f"Skipping charts: {e}")
+        return None
+    return main.plot_stock, main.CHART_PERIOD
+
+
+def run_pipeline(args, n_tickers, plot=None, per_ticker=False):
+    """
+    Run every stage once for n_tickers and return {stage: seconds} plus counts
+    """
+    synthetic = SyntheticProvider(n_tickers=n_tickers, n_bars=args.bars, missing_rate=args.missing_rate)
+    provider = LatencyProvider(synthetic, latency=args.latency, jitter=args.jitter, slow_rate=0.0)
+    tickers = synthetic.fetch_universe()
+    scan_timings = Timings(max_samples=None)
+    timings = {}
+
+    start = time.perf_counter()
+    table = scan_stocks(
+        tickers,
+        provider=provider,
+        chunk_size=args.chunk_size,
+        max_workers=args.concurrency,
+        deadline=None,
+        timings=scan_timings
+    )
+    timings['scan'] = time.perf_counter() - start
+
+    # Fetch spans overlap across workers, so their total is request time, not wall time
+    totals = scan_timings.totals()
+    timings['scan.fetch_requests'] = totals.get('fetch', 0.0)
+    timings['scan.indicators'] = totals.get('indicators', 0.0)
+    timings['scan.build_table'] = totals.get('build_table', 0.0)
+
+    if per_ticker:
+        bars = synthetic.fetch_bars(tickers, period=screening_period())
+        start = time.perf_counter()
+        for ticker, data in bars.items():
+            calculate_indicators(data, ticker)
+        timings['indicators_per_ticker'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    screened = screen_stocks(table)
+    timings['screen'] = time.perf_counter() - start
+
+    charts = 0
+    if plot is not None and args.charts:
+        plot_stock, chart_period = plot
+        chart_tickers = list(screened['Ticker'][:args.charts])
+        bars = synthetic.fetch_bars(chart_tickers, period=chart_period)
+        start = time.perf_counter()
+        for ticker in chart_tickers:
+            charts += plot_stock(ticker, bars[ticker]) is not None
+        timings['plot'] = time.perf_counter() - start
+
+    counts = {
+        'tickers': n_tickers,
+        'rows': len(table),
+        'failed': len(table.attrs['failures']),
+        'in_demand_zone': int(screened['In_Demand_Zone'].sum()),
+        'requests': provider.requests,
+        'charts': charts,
+    }
+    return timings, counts
+
+
+def peak_memory(args, n_tickers, plot=None):
+    """
+    Peak traced allocation in bytes over one pipeline run
+    """
+    tracemalloc.start()
+    try:
+        run_pipeline(args, n_tickers, plot)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[25, 500, 5000, 50000])
+    parser.add_argument('--bars', type=int, default=63)
+    parser.add_argument('--missing-rate', type=float, default=0.0, help="Fraction of bars dropped at random")
+    parser.add_argument('--latency', type=float, default=0.02, help="Seconds per simulated request")
+    parser.add_argument('--jitter', type=float, default=0.005)
+    parser.add_argument('--chunk-size', type=int, default=BATCH_CHUNK_SIZE)
+    parser.add_argument('--concurrency', type=int, default=MAX_WORKERS)
+    parser.add_argument('--charts', type=int, default=10, help="Charts drawn with plot_stock() per size (0 skips)")
+    parser.add_argument('--per-ticker', action='store_true',
+                        help="Also time the per-ticker calculate_indicators() loop")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--output', help="JSON results path (default: benchmarks/results/pipeline-<time>.json)")
+    args = parser.parse_args()
+
+    plot = load_plot_stock() if args.charts else None
+    started_at = pd.Timestamp.now(tz='UTC')
+    runs = []
+    for n_tickers in args.sizes:
+        timings, counts = run_pipeline(args, n_tickers, plot, per_ticker=args.per_ticker)
+        total = timings['scan'] + timings['screen']
+        run = {
+            **counts,
+            'seconds': timings,
+            'total_seconds': total,
+            'tickers_per_second': {
+                stage: n_tickers / timings[stage]
+                for stage in ('scan', 'scan.indicators', 'screen', 'indicators_per_ticker')
+                if timings.get(stage)
+            },
+            'ms_per_chart': timings['plot'] * 1000 / counts['charts'] if counts['charts'] else None,
+            'peak_memory_mb': None if args.no_memory else peak_memory(args, n_tickers, plot) / 2 ** 20,
+        }
+        runs.append(run)
+
+        stages = "  ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in timings.items())
+        memory = "" if run['peak_memory_mb'] is None else f"  peak={run['peak_memory_mb']:.1f}MB"
+        print(f"{n_tickers:6d} tickers  total={total:7.2f}s  {n_tickers / total:9.0f}/s  {stages}{memory}")
+
+    results = {
+        'benchmark': 'pipeline',
+        'started_at': started_at.isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'args': vars(args),
+        'runs': runs,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"pipeline-{started_at:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark the native RSI kernel against ta.momentum.RSIIndicator.
+
+    python benchmarks/bench_rsi.py --tickers 500 --bars 63
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from demand_zone.indicators import compute_rsi
+from demand_zone.providers import generate_ohlcv
+
+
+def timed(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--bars', type=int, default=63)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    closes = np.vstack([
+        generate_ohlcv(f"SYN{i:05d}", args.bars)['Close'].to_numpy()
+        for i in range(args.tickers)
+    ])
+
+    native_1d, native_rows = timed(lambda: [compute_rsi(row) for row in closes], args.repeat)
+    native_2d, native_panel = timed(lambda: compute_rsi(closes), args.repeat)
+    print(f"native 1D loop : {native_1d * 1000:9.2f} ms")
+    print(f"native 2D panel: {native_2d * 1000:9.2f} ms")
+    print(f"1D vs 2D max abs diff: {np.nanmax(np.abs(np.vstack(native_rows) - native_panel)):.3e}")
+
+    try:
+        from ta.momentum import RSIIndicator
+    except ImportError:
+        print("ta not installed; skipping parity check")
+        return
+
+    ta_time, ta_rows = timed(
+        lambda: [RSIIndicator(close=pd.Series(row), window=14).rsi().to_numpy() for row in closes],
+        args.repeat
+    )
+    print(f"ta RSIIndicator: {ta_time * 1000:9.2f} ms")
+    print(f"ta vs native max abs diff: {np.nanmax(np.abs(np.vstack(ta_rows) - native_panel)):.3e}")
+
+
+if __name__ == '__main__':
+    main()
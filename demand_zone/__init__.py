@@ -0,0 +1,3 @@
+"""
+Data and analysis helpers for the S&P 500 Demand Zone Analyzer
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from demand_zone.cli import main
+
+sys.exit(main())
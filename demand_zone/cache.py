@@ -0,0 +1,273 @@
+import json
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import pandas as pd
+
+from demand_zone.market_calendar import FRESHNESS_INTERVAL
+
+LOGGER = logging.getLogger("demand_zone.cache")
+
+
+def estimate_size(value):
+    """
+    Approximate resident size of a cached value in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Thread-safe, process-wide LRU cache with a TTL and a memory cap.
+    Entries are evicted least recently used first once max_bytes is exceeded.
+    put() accepts an explicit wall-clock expiry, e.g. from
+    market_calendar.fresh_until(), in place of the default TTL.
+    """
+
+    def __init__(self, ttl=FRESHNESS_INTERVAL.total_seconds(), max_bytes=256 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, size, expires_at = entry
+            if time.time() >= expires_at:
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, expires_at=None):
+        size = estimate_size(value)
+        if expires_at is None:
+            expires_at = time.time() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the
+    work and every concurrent caller for that key waits for and shares its
+    result (or exception)
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            owner = call is None
+            if owner:
+                call = self._calls[key] = Future()
+
+        if not owner:
+            return call.result()
+
+        try:
+            result = func()
+            call.set_result(result)
+            return result
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def do_many(self, keys, func, errors=None):
+        """
+        Run func(owned_keys) -> {key: value} for the keys not already in
+        flight, wait for the rest, and return values for every key. Keys
+        whose in-flight owner failed are left out of the result and, with
+        an errors dict, mapped to the owner's exception there.
+        """
+        with self._lock:
+            owned = {}
+            waiting = {}
+            for key in keys:
+                if key in owned:
+                    continue
+                if key in self._calls:
+                    waiting[key] = self._calls[key]
+                else:
+                    owned[key] = self._calls[key] = Future()
+
+        results = {}
+        try:
+            if owned:
+                results = dict(func(list(owned)))
+            for key, call in owned.items():
+                call.set_result(results.get(key))
+        except BaseException as e:
+            for call in owned.values():
+                if not call.done():
+                    call.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                for key in owned:
+                    del self._calls[key]
+
+        for key, call in waiting.items():
+            try:
+                results[key] = call.result()
+            except Exception as e:
+                if errors is not None:
+                    errors[key] = e
+        return results
+
+
+class BackgroundJobs:
+    """
+    Runs named jobs on daemon threads, at most one per key at a time. A
+    failed job is logged as a JSON line and kept for last_error() until the
+    next run of that key succeeds.
+    """
+
+    def __init__(self, logger=LOGGER):
+        self.logger = logger
+        self._running = set()
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def is_running(self, key):
+        with self._lock:
+            return key in self._running
+
+    def last_error(self, key):
+        """
+        Exception raised by the last run of key, or None if it succeeded
+        """
+        with self._lock:
+            return self._errors.get(key)
+
+    def run(self, key, func):
+        """
+        Start func() on a daemon thread unless a job for key is already
+        running. Returns whether a new job was started.
+        """
+        with self._lock:
+            if key in self._running:
+                return False
+            self._running.add(key)
+
+        def target():
+            error = None
+            try:
+                func()
+            except Exception as e:
+                error = e
+                self.logger.warning(json.dumps({
+                    'event': 'refresh_failed',
+                    'key': _describe_key(key),
+                    'error': f"{type(e).__name__}: {e}"[:200],
+                }))
+            finally:
+                with self._lock:
+                    self._running.discard(key)
+                    if error is None:
+                        self._errors.pop(key, None)
+                    else:
+                        self._errors[key] = error
+
+        threading.Thread(target=target, name=f"background-{hash(key) & 0xffff:x}", daemon=True).start()
+        return True
+
+
+class SnapshotStore:
+    """
+    Latest completed result per key, served immediately even when stale
+    while a background thread computes its replacement. Publishing swaps
+    the whole value under a lock, so readers never see a partial result.
+    """
+
+    def __init__(self, max_entries=32, logger=LOGGER):
+        self.max_entries = max_entries
+        self._snapshots = OrderedDict()
+        self._jobs = BackgroundJobs(logger)
+        self._lock = threading.Lock()
+
+    def latest(self, key):
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                self._snapshots.move_to_end(key)
+            return snapshot
+
+    def publish(self, key, value):
+        with self._lock:
+            self._snapshots[key] = value
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_entries:
+                self._snapshots.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+    def is_refreshing(self, key):
+        return self._jobs.is_running(key)
+
+    def last_error(self, key):
+        """
+        Exception raised by the last background refresh of key, or None if
+        it succeeded
+        """
+        return self._jobs.last_error(key)
+
+    def refresh(self, key, compute):
+        """
+        Run compute() on a daemon thread unless a refresh for key is already
+        running; compute is responsible for publishing its result. A failed
+        refresh is logged as a JSON line and kept for last_error(). Returns
+        whether a new refresh was started.
+        """
+        return self._jobs.run(key, compute)
+
+
+def _describe_key(key):
+    # Universe keys are tuples of hundreds of tickers
+    if isinstance(key, tuple):
+        return f"{len(key)} tickers"
+    return str(key)
@@ -0,0 +1,189 @@
+"""
+Headless demand zone screen: fetch -> indicators -> screen -> file.
+
+    python -m demand_zone --top-n 100 --output results.parquet
+    DEMAND_ZONE_PROVIDER=synthetic python -m demand_zone --format json
+
+Uses the same provider selection and thresholds as the Streamlit app but
+never imports Streamlit or Plotly.
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from demand_zone.constituents import FALLBACK_TICKERS, is_stale
+from demand_zone.failures import FailureReport
+from demand_zone.fetch import REQUEST_TIMEOUT, SCAN_DEADLINE
+from demand_zone.metadata import MetadataIndex, top_by_market_cap
+from demand_zone.providers import provider_from_env
+from demand_zone.scan import BATCH_CHUNK_SIZE, MAX_WORKERS, scan_stocks
+from demand_zone.screen import (
+    DEFAULT_DISTANCE_THRESHOLD, DEFAULT_RSI_THRESHOLD, DEFAULT_VOLUME_THRESHOLD, screen_stocks
+)
+from demand_zone.store import OHLCVStore
+from demand_zone.timing import Timings
+
+OUTPUT_FORMATS = ('parquet', 'csv', 'json')
+
+
+def output_format(path, fmt=None):
+    """
+    Output format from an explicit choice or the output file's suffix
+    """
+    if fmt == 'parquet' and not path:
+        raise ValueError("Parquet output needs an --output path")
+    if fmt is not None:
+        return fmt
+    suffix = Path(path).suffix.lstrip('.').lower() if path else ''
+    if suffix in OUTPUT_FORMATS:
+        return suffix
+    if path:
+        raise ValueError(f"Cannot infer output format from {path!r}; pass --format")
+    return 'csv'
+
+
+def write_results(table, path=None, fmt='csv'):
+    """
+    Write a screened table to path, or CSV/JSON to stdout when path is None
+    """
+    if fmt == 'parquet':
+        # Run metadata (as_of timestamps) is not JSON-serializable parquet metadata
+        table = table.copy()
+        table.attrs = {}
+        table.to_parquet(path, index=False)
+    elif fmt == 'csv':
+        table.to_csv(path if path is not None else sys.stdout, index=False)
+    elif fmt == 'json':
+        text = table.to_json(orient='records', indent=2)
+        if path is None:
+            sys.stdout.write(text + "\n")
+        else:
+            Path(path).write_text(text)
+    else:
+        raise ValueError(f"Unknown output format {fmt!r}")
+
+
+def load_universe(provider):
+    """
+    Ticker universe for a headless run. A current stored constituent list
+    is used as is; otherwise the list is refreshed, falling back to the
+    stored list and then to the built-in major stocks when the upstream is
+    unreachable.
+    """
+    snapshot = provider.stored_universe()
+    if snapshot and not is_stale(snapshot):
+        return snapshot['tickers']
+
+    try:
+        return provider.fetch_universe()
+    except Exception as e:
+        if snapshot:
+            print(f"warning: failed to fetch ticker list ({e}); using the stored list of "
+                  f"{len(snapshot['tickers'])} tickers", file=sys.stderr)
+            return snapshot['tickers']
+        print(f"warning: failed to fetch ticker list ({e}); using {len(FALLBACK_TICKERS)} major stocks",
+              file=sys.stderr)
+        return FALLBACK_TICKERS
+
+
+def run_screen(tickers, rsi_threshold=DEFAULT_RSI_THRESHOLD, distance_threshold=DEFAULT_DISTANCE_THRESHOLD,
+               volume_threshold=DEFAULT_VOLUME_THRESHOLD, **scan_options):
+    """
+    Scan tickers and flag demand zone stocks; scan_options go to scan_stocks()
+    """
+    timings = scan_options.get('timings')
+    table = scan_stocks(list(tickers), **scan_options)
+    if timings is None:
+        return screen_stocks(table, rsi_threshold, distance_threshold, volume_threshold)
+    with timings.span('screen'):
+        return screen_stocks(table, rsi_threshold, distance_threshold, volume_threshold)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m demand_zone",
+        description="Screen S&P 500 stocks for demand zones without the web UI"
+    )
+    parser.add_argument('--tickers', nargs='+', help="Symbols to screen (default: the provider's universe)")
+    parser.add_argument('--top-n', type=int, help="Screen only the N largest tickers by market cap")
+    parser.add_argument('--rsi', type=float, default=DEFAULT_RSI_THRESHOLD, help="RSI threshold")
+    parser.add_argument('--distance', type=float, default=DEFAULT_DISTANCE_THRESHOLD,
+                        help="Maximum percentage above the 30-day low")
+    parser.add_argument('--volume', type=float, default=DEFAULT_VOLUME_THRESHOLD, help="Minimum volume")
+    parser.add_argument('--period', help="Fetch window, e.g. 3mo (default: what the indicators need)")
+    parser.add_argument('--chunk-size', type=int, default=BATCH_CHUNK_SIZE)
+    parser.add_argument('--concurrency', type=int, default=MAX_WORKERS)
+    parser.add_argument('--request-timeout', type=float, default=REQUEST_TIMEOUT)
+    parser.add_argument('--deadline', type=float, default=SCAN_DEADLINE)
+    parser.add_argument('--no-store', action='store_true', help="Do not read or update the local price store")
+    parser.add_argument('--demand-zone-only', action='store_true', help="Only write stocks in a demand zone")
+    parser.add_argument('--output', '-o', help="Output file (default: stdout)")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help="Output format (default: from --output suffix)")
+    parser.add_argument('--failures-output', help="Write failed tickers with reasons to this CSV file")
+    parser.add_argument('--log-level', default='WARNING', choices=['DEBUG', 'INFO', 'WARNING'],
+                        help="INFO logs a JSON line per timed stage, DEBUG also per fetched ticker")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        fmt = output_format(args.output, args.format)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    logging.basicConfig(stream=sys.stderr, format='%(message)s')
+    logging.getLogger('demand_zone').setLevel(args.log_level)
+    timings = Timings()
+    failures = FailureReport()
+
+    provider = provider_from_env()
+    with timings.span('universe'):
+        tickers = args.tickers or load_universe(provider)
+    if args.top_n is not None:
+        with timings.span('select_top_n'):
+            index = MetadataIndex()
+            try:
+                metadata = index.refresh(provider, tickers)
+            except Exception as e:
+                print(f"warning: metadata refresh failed ({e}); ranking by stored market caps", file=sys.stderr)
+                metadata = index.read()
+            tickers = top_by_market_cap(tickers, metadata, args.top_n)
+
+    table = run_screen(
+        tickers,
+        rsi_threshold=args.rsi,
+        distance_threshold=args.distance,
+        volume_threshold=args.volume,
+        period=args.period,
+        chunk_size=args.chunk_size,
+        max_workers=args.concurrency,
+        request_timeout=args.request_timeout,
+        deadline=args.deadline,
+        store=None if args.no_store else OHLCVStore(),
+        provider=provider,
+        timings=timings,
+        failures=failures
+    )
+    if args.demand_zone_only:
+        table = table[table['In_Demand_Zone']]
+
+    with timings.span('write', format=fmt):
+        write_results(table, args.output, fmt)
+    timings.log_summary()
+    if args.failures_output:
+        failures.to_frame().to_csv(args.failures_output, index=False)
+
+    if table.attrs.get('incomplete'):
+        print(f"warning: {len(table.attrs['unfetched'])} tickers were not fetched in time", file=sys.stderr)
+    print(
+        f"Screened {len(tickers)} tickers as of {table.attrs['as_of']:%Y-%m-%d %H:%M %Z}: "
+        f"{int(table['In_Demand_Zone'].sum())} in a demand zone",
+        file=sys.stderr
+    )
+    if len(failures):
+        counts = ", ".join(f"{reason}={count}" for reason, count in failures.counts().items())
+        print(f"{len(failures)} tickers dropped: {counts}", file=sys.stderr)
+    return 0
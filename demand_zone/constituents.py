@@ -0,0 +1,150 @@
+import json
+from html.parser import HTMLParser
+from pathlib import Path
+
+import pandas as pd
+
+from demand_zone.store import DEFAULT_STORE_DIR, atomic_write, log_unreadable
+
+SP500_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+
+USER_AGENT = "sp500-demand-zone-analyzer/1.0"
+
+# Index membership changes a handful of times a quarter
+CONSTITUENTS_MAX_AGE = pd.Timedelta(days=1)
+
+# Major S&P 500 stocks, used only before any constituent list was stored
+FALLBACK_TICKERS = [
+    'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'BRK-B', 'LLY', 'V', 'TSM',
+    'UNH', 'XOM', 'JPM', 'JNJ', 'PG', 'MA', 'HD', 'CVX', 'AVGO', 'KO',
+    'PEP', 'COST', 'MRK', 'ABBV', 'BAC', 'PFE', 'TMO', 'ACN', 'DHR', 'VZ',
+    'ADBE', 'NFLX', 'CRM', 'CMCSA', 'DIS', 'NEE', 'PM', 'TXN', 'RTX', 'QCOM',
+    'HON', 'LOW', 'UPS', 'IBM', 'INTU', 'MS', 'SPGI', 'GS', 'CAT', 'DE'
+]
+
+
+class _SymbolColumnParser(HTMLParser):
+    # Collects the text of the first <td> in each row of a single table
+    def __init__(self):
+        super().__init__()
+        self.symbols = []
+        self._cell = -1
+        self._text = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self._cell = -1
+        elif tag in ('td', 'th'):
+            self._cell += 1
+            if tag == 'td' and self._cell == 0:
+                self._text = []
+
+    def handle_endtag(self, tag):
+        if tag == 'td' and self._text is not None:
+            symbol = ''.join(self._text).strip()
+            if symbol:
+                self.symbols.append(symbol)
+            self._text = None
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+
+def parse_constituent_symbols(html):
+    """
+    Extract ticker symbols from the constituents table only, without
+    parsing the rest of the page
+    """
+    anchor = html.find('id="constituents"')
+    if anchor == -1:
+        anchor = html.find('class="wikitable')
+    if anchor == -1:
+        raise ValueError("Constituents table not found")
+
+    start = html.rfind('<table', 0, anchor)
+    end = html.find('</table>', anchor)
+    if start == -1 or end == -1:
+        raise ValueError("Constituents table is malformed")
+
+    parser = _SymbolColumnParser()
+    parser.feed(html[start:end + len('</table>')])
+    parser.close()
+    if not parser.symbols:
+        raise ValueError("Constituents table has no symbols")
+
+    # Yahoo uses dashes for share classes (BRK.B -> BRK-B)
+    return [symbol.replace('.', '-') for symbol in parser.symbols]
+
+
+def is_stale(snapshot, max_age=CONSTITUENTS_MAX_AGE, now=None):
+    """
+    Whether a constituent snapshot is due for revalidation
+    """
+    if not snapshot.get('fetched_at'):
+        return True
+    now = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+    return now - pd.Timestamp(snapshot['fetched_at']) >= max_age
+
+
+class ConstituentStore:
+    """
+    Persisted S&P 500 constituent snapshot refreshed with conditional
+    requests, so an unchanged page costs a 304 and no parsing
+    """
+
+    def __init__(self, path=None, url=SP500_URL):
+        self.path = Path(path) if path is not None else DEFAULT_STORE_DIR / "sp500_constituents.json"
+        self.url = url
+
+    def load(self):
+        """
+        Return the stored snapshot dict (tickers, etag, last_modified,
+        fetched_at) or None
+        """
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path) as handle:
+                snapshot = json.load(handle)
+        except Exception as e:
+            log_unreadable(self.path, e)
+            return None
+
+        return snapshot if snapshot.get('tickers') else None
+
+    def save(self, snapshot):
+        atomic_write(self.path, lambda tmp_path: Path(tmp_path).write_text(json.dumps(snapshot)))
+
+    def refresh(self, timeout=10):
+        """
+        Revalidate the snapshot against the upstream page and return the
+        current ticker list
+        """
+        import requests
+
+        snapshot = self.load() or {}
+        headers = {'User-Agent': USER_AGENT}
+        if snapshot.get('etag'):
+            headers['If-None-Match'] = snapshot['etag']
+        if snapshot.get('last_modified'):
+            headers['If-Modified-Since'] = snapshot['last_modified']
+
+        response = requests.get(self.url, headers=headers, timeout=timeout)
+        fetched_at = pd.Timestamp.now(tz='UTC').isoformat()
+
+        if response.status_code == 304 and snapshot.get('tickers'):
+            snapshot['fetched_at'] = fetched_at
+            self.save(snapshot)
+            return snapshot['tickers']
+
+        response.raise_for_status()
+        snapshot = {
+            'tickers': parse_constituent_symbols(response.text),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': fetched_at,
+        }
+        self.save(snapshot)
+        return snapshot['tickers']
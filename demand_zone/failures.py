@@ -0,0 +1,90 @@
+import json
+import logging
+import threading
+
+import pandas as pd
+
+from demand_zone.ratelimit import is_throttled
+
+LOGGER = logging.getLogger("demand_zone.failures")
+
+TIMEOUT = 'timeout'
+MISSED_DEADLINE = 'missed_deadline'
+THROTTLED = 'throttled'
+EMPTY_DATA = 'empty_data'
+INSUFFICIENT_BARS = 'insufficient_bars'
+NAN_INDICATORS = 'nan_indicators'
+ERROR = 'error'
+
+REASONS = [TIMEOUT, MISSED_DEADLINE, THROTTLED, EMPTY_DATA, INSUFFICIENT_BARS, NAN_INDICATORS, ERROR]
+
+
+def classify_exception(exc):
+    """
+    Failure reason for an exception raised while fetching a ticker
+    """
+    if is_throttled(exc):
+        return THROTTLED
+    if isinstance(exc, TimeoutError) or 'Timeout' in type(exc).__name__:
+        return TIMEOUT
+    return ERROR
+
+
+class FailureReport:
+    """
+    Thread-safe record of why tickers dropped out of one scan. Each ticker
+    keeps its most recent reason and a short detail string.
+    """
+
+    def __init__(self, logger=LOGGER):
+        self.logger = logger
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def add(self, tickers, reason, detail=None):
+        with self._lock:
+            for ticker in tickers:
+                self._failures[ticker] = (reason, detail)
+
+    def add_exception(self, tickers, exc):
+        self.add(tickers, classify_exception(exc), f"{type(exc).__name__}: {exc}"[:200])
+
+    def to_dict(self):
+        """
+        Plain {ticker: reason} mapping, safe to keep in DataFrame.attrs
+        """
+        with self._lock:
+            return {ticker: reason for ticker, (reason, _) in self._failures.items()}
+
+    def counts(self):
+        """
+        Number of failed tickers per reason, in REASONS order
+        """
+        return failure_counts(self.to_dict())
+
+    def to_frame(self):
+        with self._lock:
+            rows = [(ticker, reason, detail) for ticker, (reason, detail) in self._failures.items()]
+        return pd.DataFrame(rows, columns=['Ticker', 'Reason', 'Detail'])
+
+    def log(self):
+        """
+        Emit the per-reason counts at INFO and every failed ticker at DEBUG
+        """
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(json.dumps({'event': 'failures', 'total': len(self), 'counts': self.counts()}))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for ticker, reason, detail in self.to_frame().itertuples(index=False):
+                self.logger.debug(json.dumps({'event': 'failure', 'ticker': ticker, 'reason': reason, 'detail': detail}))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._failures)
+
+
+def failure_counts(failures):
+    """
+    Count a {ticker: reason} mapping per reason, omitting reasons with none
+    """
+    counts = pd.Series(list(failures.values()), dtype=object).value_counts()
+    return {reason: int(counts[reason]) for reason in REASONS if reason in counts}
@@ -0,0 +1,164 @@
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+REQUEST_TIMEOUT = 30
+SCAN_DEADLINE = 120
+
+
+class FetchResult:
+    """
+    Bars fetched by one scan plus the tickers that did not make it
+    """
+
+    def __init__(self):
+        self.bars = {}
+        self.timed_out = []
+        self.failed = []
+        self.missed_deadline = []
+        self.errors = {}
+
+    @property
+    def incomplete(self):
+        return bool(self.timed_out or self.missed_deadline)
+
+    def add(self, chunk, fetched):
+        """
+        Record a chunk's fetched frames and return them as a dict
+        """
+        # Per-ticker fetchers return a frame (or None) rather than a dict
+        if not isinstance(fetched, dict):
+            fetched = {chunk[0]: fetched}
+        added = {ticker: fetched[ticker] for ticker in chunk if fetched.get(ticker) is not None}
+        self.bars.update(added)
+        return added
+
+    def fail(self, chunk, exc):
+        """
+        Record a chunk whose fetch raised exc
+        """
+        self.failed.extend(chunk)
+        self.errors.update(dict.fromkeys(chunk, exc))
+
+
+def fetch_chunks_threaded(chunks, fetch_chunk, max_workers=10, on_progress=None):
+    """
+    Fetch every chunk on a thread pool, waiting for all of them to finish;
+    on_progress(chunk, bars) is called as each chunk completes
+    """
+    result = FetchResult()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_chunk = {executor.submit(fetch_chunk, chunk): chunk for chunk in chunks}
+        for future in as_completed(future_to_chunk):
+            chunk = future_to_chunk[future]
+            bars = {}
+            try:
+                bars = result.add(chunk, future.result())
+            except Exception as e:
+                result.fail(chunk, e)
+            if on_progress is not None:
+                on_progress(chunk, bars)
+    return result
+
+
+async def _fetch_chunks_async(chunks, fetch_chunk, concurrency, request_timeout, deadline, on_progress):
+    result = FetchResult()
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # Dedicated pool so concurrency is not capped by the default executor
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def run(chunk):
+        await semaphore.acquire()
+        future = loop.run_in_executor(executor, fetch_chunk, chunk)
+
+        # A timed-out request keeps its worker thread busy, so its slot is
+        # only released once the thread is free; otherwise the next chunks
+        # would queue in the executor with their timeout already running
+        future.add_done_callback(lambda _: semaphore.release())
+        return await asyncio.wait_for(asyncio.shield(future), request_timeout)
+
+    tasks = {asyncio.ensure_future(run(chunk)): chunk for chunk in chunks}
+    deadline_at = None if deadline is None else loop.time() + deadline
+    pending = set(tasks)
+    try:
+        while pending:
+            timeout = None if deadline_at is None else max(0.0, deadline_at - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+
+            for task in done:
+                chunk = tasks[task]
+                bars = {}
+                try:
+                    bars = result.add(chunk, task.result())
+                except asyncio.TimeoutError:
+                    result.timed_out.extend(chunk)
+                except Exception as e:
+                    result.fail(chunk, e)
+                if on_progress is not None:
+                    on_progress(chunk, bars)
+
+        for task in pending:
+            task.cancel()
+            result.missed_deadline.extend(tasks[task])
+    finally:
+        # Threads stuck in a slow request finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return result
+
+
+def fetch_chunks_async(chunks, fetch_chunk, concurrency=10, request_timeout=REQUEST_TIMEOUT,
+                       deadline=SCAN_DEADLINE, on_progress=None):
+    """
+    Fetch chunks on an asyncio loop with at most concurrency requests in
+    flight, a per-request timeout and a global deadline in seconds. A
+    request's timeout starts once it is running on a worker thread, and a
+    timed-out request holds its slot until the thread returns. When the
+    deadline passes, the chunks still outstanding are abandoned and the
+    partial result is returned with incomplete set. on_progress(chunk, bars)
+    is called on the loop thread as each chunk completes.
+    """
+    return asyncio.run(_fetch_chunks_async(
+        list(chunks), fetch_chunk, concurrency, request_timeout, deadline, on_progress
+    ))
+
+
+def iter_fetch_chunks(chunks, fetch_chunk, engine="asyncio", **options):
+    """
+    Run a fetch engine on a worker thread and yield (chunk, bars) in the
+    caller's thread as chunks complete. The generator's return value is the
+    engine's FetchResult. options go to fetch_chunks_async() or, for
+    engine="threads", fetch_chunks_threaded().
+    """
+    completed = queue.Queue()
+    finished = object()
+    outcome = {}
+
+    def run():
+        try:
+            on_progress = lambda chunk, bars: completed.put((chunk, bars))
+            if engine == "asyncio":
+                outcome['result'] = fetch_chunks_async(chunks, fetch_chunk, on_progress=on_progress, **options)
+            else:
+                outcome['result'] = fetch_chunks_threaded(chunks, fetch_chunk, on_progress=on_progress, **options)
+        except BaseException as e:
+            outcome['error'] = e
+        finally:
+            completed.put(finished)
+
+    threading.Thread(target=run, name="fetch-engine", daemon=True).start()
+
+    while True:
+        item = completed.get()
+        if item is finished:
+            break
+        yield item
+
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
@@ -0,0 +1,423 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+RSI_WINDOW = 14
+LOW_WINDOW = 30
+WEEK_BARS = 5
+MONTH_BARS = 21
+MIN_BARS = 30
+
+# Extra bars that let the Wilder averages converge before the screened bar
+RSI_WARMUP_BARS = 2 * RSI_WINDOW
+
+# Bars of history each screening indicator needs for its final value
+INDICATOR_LOOKBACKS = {
+    'rsi': RSI_WINDOW + RSI_WARMUP_BARS,
+    'low_30d': LOW_WINDOW,
+    'weekly_change': WEEK_BARS + 1,
+    'monthly_change': MONTH_BARS + 1,
+}
+
+# Covers trading halts and bars dropped by the upstream
+FETCH_MARGIN_BARS = 5
+
+INDICATOR_COLUMNS = [
+    'rsi', 'distance_from_low', 'weekly_change', 'monthly_change',
+    'volume', 'close', 'low_30d'
+]
+
+
+def required_bars(indicators=None, margin=FETCH_MARGIN_BARS):
+    """
+    Minimum bars of history to fetch for the given indicators (all of them
+    by default), never fewer than MIN_BARS
+    """
+    indicators = INDICATOR_LOOKBACKS if indicators is None else indicators
+    return max([MIN_BARS] + [INDICATOR_LOOKBACKS[name] for name in indicators]) + margin
+
+
+def build_panel(bars, fields=('Low', 'Close', 'Volume'), length=None):
+    """
+    Align per-ticker OHLCV frames into ticker x bar float arrays per field.
+    Series are right-aligned on their last bar, so column -k is always the
+    k-th most recent bar of each ticker and shifts stay per-ticker exact;
+    shorter histories are NaN-padded on the left.
+    """
+    tickers = list(bars)
+    if length is None:
+        length = max((len(bars[ticker]) for ticker in tickers), default=0)
+
+    panel = {field: np.full((len(tickers), length), np.nan) for field in fields}
+    for row, ticker in enumerate(tickers):
+        values = bars[ticker][list(fields)].to_numpy(dtype=float)[-length:]
+        for col, field in enumerate(fields):
+            panel[field][row, length - len(values):] = values[:, col]
+
+    return tickers, panel
+
+
+def _directional_moves(close):
+    # Up/down moves per bar; bars before a ticker's first close are padding
+    # (NaN) rather than zero moves, matching how ta seeds its averages
+    diff = np.full_like(close, np.nan)
+    diff[:, 1:] = close[:, 1:] - close[:, :-1]
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+
+    started = np.cumsum(~np.isnan(close), axis=1) > 0
+    up[~started] = np.nan
+    down[~started] = np.nan
+    return up, down, started
+
+
+def _rsi_from_averages(avg_up, avg_down):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(avg_down == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_up / avg_down))
+
+
+def rsi_panel(close, window=RSI_WINDOW):
+    """
+    Wilder RSI over each row of a ticker x bar close array, matching
+    ta.momentum.RSIIndicator (EWM with alpha=1/window, adjust=False)
+    """
+    n_rows, n_bars = close.shape
+    rsi = np.full((n_rows, n_bars), np.nan)
+    up, down, started = _directional_moves(close)
+
+    alpha = 1.0 / window
+    avg_up = np.full(n_rows, np.nan)
+    avg_down = np.full(n_rows, np.nan)
+    seen = np.zeros(n_rows)
+    for t in range(n_bars):
+        avg_up = np.where(np.isnan(avg_up), up[:, t], (1 - alpha) * avg_up + alpha * up[:, t])
+        avg_down = np.where(np.isnan(avg_down), down[:, t], (1 - alpha) * avg_down + alpha * down[:, t])
+        seen += started[:, t]
+        rsi[:, t] = np.where(seen >= window, _rsi_from_averages(avg_up, avg_down), np.nan)
+
+    return rsi
+
+
+def compute_rsi(close, window=RSI_WINDOW):
+    """
+    Native RSI kernel for a 1D close series or a 2D ticker x bar panel;
+    numerically matches ta.momentum.RSIIndicator(window=window).rsi().
+    Leading NaNs in a panel row are treated as padding (see build_panel),
+    whereas ta and the 1D path count them as zero moves.
+    """
+    close = np.asarray(close, dtype=float)
+    if close.ndim == 1:
+        return _rsi_1d(close, window)
+    return rsi_panel(close, window)
+
+
+def _rsi_1d(close, window):
+    # Scalar loop: per-step NumPy calls cost more than the math on one row
+    rsi = np.full(len(close), np.nan)
+    alpha = 1.0 / window
+    avg_up = avg_down = math.nan
+    previous = math.nan
+    seen = 0
+    for t, value in enumerate(close.tolist()):
+        diff = value - previous
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        if seen == 0:
+            avg_up, avg_down = up, down
+        else:
+            avg_up = (1 - alpha) * avg_up + alpha * up
+            avg_down = (1 - alpha) * avg_down + alpha * down
+        previous = value
+        seen += 1
+        if seen >= window:
+            rsi[t] = 100.0 if avg_down == 0 else 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+    return rsi
+
+
+def rsi_last(close, window=RSI_WINDOW):
+    """
+    Final-bar RSI per row without materializing the series. Only the Wilder
+    averages are carried through the loop, so the result equals the last
+    column of rsi_panel; the warmup is bounded by the fetch window, which
+    required_bars() sizes to RSI_WINDOW + RSI_WARMUP_BARS plus a margin.
+    """
+    n_rows, n_bars = close.shape
+    up, down, started = _directional_moves(close)
+
+    alpha = 1.0 / window
+    avg_up = np.full(n_rows, np.nan)
+    avg_down = np.full(n_rows, np.nan)
+    for t in range(n_bars):
+        avg_up = np.where(np.isnan(avg_up), up[:, t], (1 - alpha) * avg_up + alpha * up[:, t])
+        avg_down = np.where(np.isnan(avg_down), down[:, t], (1 - alpha) * avg_down + alpha * down[:, t])
+
+    seen = started.sum(axis=1)
+    return np.where(seen >= window, _rsi_from_averages(avg_up, avg_down), np.nan)
+
+
+def rolling_min_panel(values, window=LOW_WINDOW):
+    """
+    Trailing rolling minimum per row; NaN until a full window of bars exists
+    """
+    result = np.full(values.shape, np.nan)
+    if values.shape[1] < window:
+        return result
+    result[:, window - 1:] = sliding_window_view(values, window, axis=1).min(axis=-1)
+    return result
+
+
+def pct_change_panel(values, periods):
+    """
+    Percentage change versus the value periods bars earlier, per row
+    """
+    result = np.full(values.shape, np.nan)
+    if values.shape[1] <= periods:
+        return result
+    previous = values[:, :-periods]
+    result[:, periods:] = (values[:, periods:] - previous) / previous * 100
+    return result
+
+
+def min_last(values, window=LOW_WINDOW):
+    """
+    Minimum of the trailing window per row; NaN if the window is incomplete
+    """
+    if values.shape[1] < window:
+        return np.full(values.shape[0], np.nan)
+    return values[:, -window:].min(axis=1)
+
+
+def pct_change_last(values, periods):
+    """
+    Point-to-point percentage change of the last bar versus periods bars earlier
+    """
+    if values.shape[1] <= periods:
+        return np.full(values.shape[0], np.nan)
+    previous = values[:, -1 - periods]
+    return (values[:, -1] - previous) / previous * 100
+
+
+def indicator_series(df):
+    """
+    Full indicator series for a single ticker, used for charting
+    """
+    _, panel = build_panel({'_': df})
+    close, low = panel['Close'], panel['Low']
+    low_30d = rolling_min_panel(low)
+
+    return pd.DataFrame({
+        'rsi': rsi_panel(close)[0],
+        'low_30d': low_30d[0],
+        'distance_from_low': ((close - low_30d) / low_30d * 100)[0],
+        'weekly_change': pct_change_panel(close, WEEK_BARS)[0],
+        'monthly_change': pct_change_panel(close, MONTH_BARS)[0],
+    }, index=df.index)
+
+
+def compute_indicator_panel(bars, latest_only=True):
+    """
+    Compute the latest screening indicators for a whole universe at once.
+    Returns a DataFrame indexed by ticker with INDICATOR_COLUMNS; tickers with
+    fewer than MIN_BARS bars or any NaN indicator are dropped. latest_only
+    evaluates just the trailing windows the final bar needs; False computes
+    the full series first and reads their last column.
+    """
+    bars = {ticker: data for ticker, data in bars.items() if data is not None and len(data) >= MIN_BARS}
+    if not bars:
+        return pd.DataFrame(columns=INDICATOR_COLUMNS)
+
+    tickers, panel = build_panel(bars)
+    close, low, volume = panel['Close'], panel['Low'], panel['Volume']
+
+    if latest_only:
+        rsi = rsi_last(close)
+        low_30d = min_last(low)
+        weekly_change = pct_change_last(close, WEEK_BARS)
+        monthly_change = pct_change_last(close, MONTH_BARS)
+    else:
+        rsi = rsi_panel(close)[:, -1]
+        low_30d = rolling_min_panel(low)[:, -1]
+        weekly_change = pct_change_panel(close, WEEK_BARS)[:, -1]
+        monthly_change = pct_change_panel(close, MONTH_BARS)[:, -1]
+
+    table = pd.DataFrame({
+        'rsi': rsi,
+        'distance_from_low': (close[:, -1] - low_30d) / low_30d * 100,
+        'weekly_change': weekly_change,
+        'monthly_change': monthly_change,
+        'volume': volume[:, -1],
+        'close': close[:, -1],
+        'low_30d': low_30d,
+    }, index=pd.Index(tickers, name='Ticker'))
+
+    return table.dropna()
+
+
+class IndicatorState:
+    """
+    Online indicator state for one ticker, advanced one bar at a time in O(1).
+
+    Reproduces compute_indicator_panel on the trimmed screening window. The
+    Wilder average gain/loss are seeded at the window's first bar like the
+    panel's; when the window start moves forward, the dropped move's
+    weighted contribution is subtracted, so the RSI never drifts towards a
+    full-history seed. A monotonic deque holds the 30-bar low and the
+    window's bars serve the 5- and 21-bar lookbacks. Only bars that can no
+    longer change are committed; the latest (possibly still forming) bar is
+    evaluated with peek() without mutating the state.
+    """
+
+    def __init__(self, rsi_window=RSI_WINDOW, low_window=LOW_WINDOW):
+        self.rsi_window = rsi_window
+        self.low_window = low_window
+        self.bars = 0
+        self.avg_up = math.nan
+        self.avg_down = math.nan
+        self.last_nan_low = -1
+        self.lows = deque()
+        # (date, close, up move, down move) per committed bar in the window
+        self.window = deque()
+
+    @property
+    def last_date(self):
+        return self.window[-1][0] if self.window else None
+
+    def _moves(self, close):
+        # The window's first bar has no previous close, so no move
+        diff = close - self.window[-1][1] if self.window else math.nan
+        if math.isnan(diff):
+            return 0.0, 0.0
+        return max(diff, 0.0), max(-diff, 0.0)
+
+    def _averages(self, up, down):
+        alpha = 1.0 / self.rsi_window
+        if math.isnan(self.avg_up):
+            return up, down
+        return (1 - alpha) * self.avg_up + alpha * up, (1 - alpha) * self.avg_down + alpha * down
+
+    def update(self, date, low, close):
+        """
+        Commit one finished bar
+        """
+        up, down = self._moves(close)
+        self.avg_up, self.avg_down = self._averages(up, down)
+
+        if math.isnan(low):
+            self.last_nan_low = self.bars
+        else:
+            while self.lows and self.lows[-1][1] >= low:
+                self.lows.pop()
+            self.lows.append((self.bars, low))
+        while self.lows and self.lows[0][0] <= self.bars - self.low_window:
+            self.lows.popleft()
+
+        self.window.append((pd.Timestamp(date), close, up, down))
+        self.bars += 1
+
+    def drop_before(self, start):
+        """
+        Move the window start to the first committed bar on or after start.
+        The bar that becomes first loses its move, whose weight in the
+        averages is alpha * (1 - alpha) ** (bars after it).
+        """
+        alpha = 1.0 / self.rsi_window
+        while self.window and self.window[0][0] < start:
+            self.window.popleft()
+            if not self.window:
+                self.avg_up = self.avg_down = math.nan
+                break
+
+            date, close, up, down = self.window[0]
+            weight = alpha * (1 - alpha) ** (len(self.window) - 1)
+            self.avg_up -= weight * up
+            self.avg_down -= weight * down
+            self.window[0] = (date, close, 0.0, 0.0)
+
+    def peek(self, low, close, volume):
+        """
+        Indicator values if a bar with these values were the next bar
+        """
+        up, down = self._moves(close)
+        avg_up, avg_down = self._averages(up, down)
+        n_bars = len(self.window) + 1
+        rsi = math.nan
+        if n_bars >= self.rsi_window:
+            rsi = 100.0 if avg_down == 0 else 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+
+        # At most the front of the deque falls out of the window on one step
+        low_30d = math.nan
+        if n_bars >= self.low_window and not math.isnan(low) and self.last_nan_low <= self.bars - self.low_window:
+            candidates = [value for index, value in list(self.lows)[:2] if index > self.bars - self.low_window]
+            low_30d = min(candidates[:1] + [low])
+
+        def change(periods):
+            if len(self.window) < periods:
+                return math.nan
+            previous = self.window[-periods][1]
+            return (close - previous) / previous * 100
+
+        return {
+            'rsi': rsi,
+            'distance_from_low': (close - low_30d) / low_30d * 100,
+            'weekly_change': change(WEEK_BARS),
+            'monthly_change': change(MONTH_BARS),
+            'volume': volume,
+            'close': close,
+            'low_30d': low_30d,
+        }
+
+    def advance(self, df):
+        """
+        Bring the state up to df, a trimmed screening window (the frame
+        compute_indicator_panel would get), and return the indicators for
+        its final bar. Only bars after last_date are committed, so a daily
+        or intraday refresh costs O(1); the state is replayed from df when
+        it cannot slide onto df's window.
+        """
+        if df.empty:
+            return None
+
+        start = df.index[0]
+        resumable = (
+            self.last_date is not None
+            and self.window[0][0] <= start
+            and self.last_date in df.index
+            and self.last_date < df.index[-1]
+        )
+        if not resumable:
+            self.__init__(self.rsi_window, self.low_window)
+
+        new_bars = df if self.last_date is None else df[df.index > self.last_date]
+        lows = new_bars['Low'].to_numpy(dtype=float)
+        closes = new_bars['Close'].to_numpy(dtype=float)
+        for date, low, close in zip(new_bars.index[:-1], lows[:-1], closes[:-1]):
+            self.update(date, low, close)
+        self.drop_before(start)
+
+        return self.peek(lows[-1], closes[-1], float(new_bars['Volume'].iloc[-1]))
+
+    def to_dict(self):
+        return {
+            'rsi_window': self.rsi_window,
+            'low_window': self.low_window,
+            'bars': self.bars,
+            'avg_up': self.avg_up,
+            'avg_down': self.avg_down,
+            'last_nan_low': self.last_nan_low,
+            'lows': [list(item) for item in self.lows],
+            'window': [[date.isoformat(), close, up, down] for date, close, up, down in self.window],
+        }
+
+    @classmethod
+    def from_dict(cls, payload):
+        state = cls(payload['rsi_window'], payload['low_window'])
+        state.bars = payload['bars']
+        state.avg_up = payload['avg_up']
+        state.avg_down = payload['avg_down']
+        state.last_nan_low = payload['last_nan_low']
+        state.lows = deque(tuple(item) for item in payload['lows'])
+        state.window = deque((pd.Timestamp(date), close, up, down) for date, close, up, down in payload['window'])
+        return state
@@ -0,0 +1,137 @@
+from functools import lru_cache
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, GoodFriday, Holiday, USLaborDay, USMartinLutherKingJr,
+    USMemorialDay, USPresidentsDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+)
+
+MARKET_TZ = "America/New_York"
+MARKET_OPEN = pd.Timedelta(hours=9, minutes=30)
+MARKET_CLOSE = pd.Timedelta(hours=16)
+EARLY_CLOSE = pd.Timedelta(hours=13)
+
+# Final prints and Yahoo's quote delay can still revise the closing bar
+SETTLE_PERIOD = pd.Timedelta(minutes=20)
+
+# Yahoo Finance quotes are delayed, so finer buckets buy nothing
+FRESHNESS_INTERVAL = pd.Timedelta(minutes=15)
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """
+    Full-day NYSE holidays
+    """
+    rules = [
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday),
+    ]
+
+
+@lru_cache(maxsize=None)
+def _holidays(year):
+    dates = NYSEHolidayCalendar().holidays(start=f"{year}-01-01", end=f"{year}-12-31")
+    return frozenset(date.date() for date in dates)
+
+
+def _now(now):
+    if now is None:
+        return pd.Timestamp.now(tz=MARKET_TZ)
+    now = pd.Timestamp(now)
+    return now.tz_localize(MARKET_TZ) if now.tz is None else now.tz_convert(MARKET_TZ)
+
+
+def is_trading_day(day):
+    day = pd.Timestamp(day)
+    return day.weekday() < 5 and day.date() not in _holidays(day.year)
+
+
+def session_open(day):
+    return _now(day).normalize() + MARKET_OPEN
+
+
+def session_close(day):
+    """
+    Closing time of the session on day, accounting for 1 pm early closes
+    """
+    day = _now(day).normalize()
+    thanksgiving = USThanksgivingDay.dates(f"{day.year}-11-01", f"{day.year}-11-30")[0]
+    early = (
+        day.date() == (thanksgiving + pd.Timedelta(days=1)).date()
+        or (day.month == 12 and day.day == 24)
+        or (day.month == 7 and day.day == 3)
+    )
+    return day + (EARLY_CLOSE if early else MARKET_CLOSE)
+
+
+def next_session(day):
+    """
+    First trading day strictly after day
+    """
+    day = _now(day).normalize() + pd.Timedelta(days=1)
+    while not is_trading_day(day):
+        day += pd.Timedelta(days=1)
+    return day
+
+
+def previous_session(day):
+    """
+    Last trading day strictly before day
+    """
+    day = _now(day).normalize() - pd.Timedelta(days=1)
+    while not is_trading_day(day):
+        day -= pd.Timedelta(days=1)
+    return day
+
+
+def is_market_open(now=None):
+    now = _now(now)
+    return is_trading_day(now) and session_open(now) <= now < session_close(now)
+
+
+def data_as_of(now=None, interval=FRESHNESS_INTERVAL):
+    """
+    Timestamp of the newest market data that can exist at now: the current
+    interval bucket during a session, otherwise the last session close
+    """
+    now = _now(now)
+    if is_market_open(now):
+        return now.floor(interval)
+
+    if is_trading_day(now) and now >= session_close(now):
+        return session_close(now)
+    return session_close(previous_session(now))
+
+
+def fresh_until(fetched_at=None, interval=FRESHNESS_INTERVAL):
+    """
+    When data fetched at fetched_at may have changed upstream: one interval
+    later during a session (and while the close settles), otherwise not
+    before the next session opens
+    """
+    fetched_at = _now(fetched_at)
+    if is_trading_day(fetched_at):
+        if session_open(fetched_at) <= fetched_at < session_close(fetched_at) + SETTLE_PERIOD:
+            return fetched_at + interval
+        if fetched_at < session_open(fetched_at):
+            return session_open(fetched_at)
+    return session_open(next_session(fetched_at))
+
+
+def sessions_to_period(sessions, now=None):
+    """
+    Smallest "<N>d" period string that spans the last sessions trading days
+    """
+    last = data_as_of(now).normalize()
+    first = last
+    for _ in range(sessions - 1):
+        first = previous_session(first)
+    return f"{(last - first).days + 1}d"
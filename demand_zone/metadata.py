@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from demand_zone.providers import METADATA_COLUMNS
+from demand_zone.ratelimit import is_throttled
+from demand_zone.store import DEFAULT_STORE_DIR, atomic_write, log_unreadable
+
+# Market caps drift slowly enough that a weekly refresh keeps the ranking honest
+METADATA_MAX_AGE = pd.Timedelta(days=7)
+
+# Tickers per provider call, so progress is persisted as the refresh runs
+METADATA_CHUNK_SIZE = 50
+
+# Pause before refreshing again after the upstream throttled a refresh
+METADATA_RETRY_DELAY = pd.Timedelta(minutes=15)
+
+
+class MetadataIndex:
+    """
+    Parquet-backed per-ticker company metadata (market cap, sector, shares
+    outstanding) with a fetched_at column, refreshed per ticker once it is
+    older than max_age. A refresh that was throttled or left tickers
+    without metadata is not repeated for retry_delay.
+    """
+
+    def __init__(self, path=None, max_age=METADATA_MAX_AGE, retry_delay=METADATA_RETRY_DELAY):
+        self.path = Path(path) if path is not None else DEFAULT_STORE_DIR / "metadata.parquet"
+        self.max_age = max_age
+        self.retry_delay = retry_delay
+        self.retry_after = None
+
+    def read(self):
+        """
+        Return the stored metadata indexed by ticker, empty if nothing is stored
+        """
+        if self.path.exists():
+            try:
+                return pd.read_parquet(self.path)
+            except Exception as e:
+                log_unreadable(self.path, e)
+        return pd.DataFrame(columns=METADATA_COLUMNS + ['fetched_at'])
+
+    def stale_tickers(self, tickers, metadata=None, now=None):
+        """
+        Tickers with no stored metadata or metadata older than max_age
+        """
+        metadata = self.read() if metadata is None else metadata
+        now = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+        fetched_at = pd.to_datetime(metadata['fetched_at'], utc=True).reindex(list(tickers))
+        return [ticker for ticker, at in fetched_at.items() if pd.isna(at) or now - at >= self.max_age]
+
+    def refresh_due(self, tickers, metadata=None, now=None):
+        """
+        Whether any ticker is stale and no throttling back-off is in effect
+        """
+        now = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+        if self.retry_after is not None and now < self.retry_after:
+            return False
+        return bool(self.stale_tickers(tickers, metadata, now))
+
+    def refresh(self, provider, tickers, chunk_size=METADATA_CHUNK_SIZE):
+        """
+        Fetch metadata for the stale tickers and merge it into the index.
+        Chunks already fetched stay persisted if the upstream throttles; the
+        error is re-raised and further refreshes wait for retry_delay.
+        """
+        metadata = self.read()
+        stale = self.stale_tickers(tickers, metadata)
+        for i in range(0, len(stale), chunk_size):
+            try:
+                fetched = provider.fetch_metadata(stale[i:i + chunk_size])
+            except Exception as e:
+                if is_throttled(e):
+                    self.retry_after = pd.Timestamp.now(tz='UTC') + self.retry_delay
+                raise
+            if fetched.empty:
+                continue
+
+            fetched = fetched.reindex(columns=METADATA_COLUMNS)
+            fetched['fetched_at'] = pd.Timestamp.now(tz='UTC')
+            metadata = pd.concat([metadata.drop(fetched.index, errors='ignore'), fetched])
+            self._write(metadata)
+
+        # Tickers the upstream has no metadata for would otherwise restart
+        # the refresh on every rerun
+        if self.stale_tickers(tickers, metadata):
+            self.retry_after = pd.Timestamp.now(tz='UTC') + self.retry_delay
+        return metadata
+
+    def _write(self, metadata):
+        atomic_write(self.path, metadata.to_parquet)
+
+
+def top_by_market_cap(tickers, metadata, n):
+    """
+    The n largest tickers by market cap, largest first, via a partial sort.
+    Tickers without a known market cap rank last in their original order.
+    """
+    tickers = list(tickers)
+    if n <= 0 or not tickers:
+        return []
+
+    caps = pd.to_numeric(metadata['market_cap'], errors='coerce').reindex(tickers).to_numpy(dtype=float)
+    keys = -np.nan_to_num(caps, nan=-np.inf)
+
+    n = min(n, len(tickers))
+    kth = np.partition(keys, n - 1)[n - 1]
+
+    # Ties at the cut (e.g. unknown caps) are filled in universe order
+    better = np.flatnonzero(keys < kth)
+    ties = np.flatnonzero(keys == kth)[:n - len(better)]
+    top = np.concatenate([better, ties])
+
+    # Order the selection by cap, breaking ties by universe position
+    top = top[np.lexsort((top, keys[top]))]
+    return [tickers[i] for i in top]
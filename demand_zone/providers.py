@@ -0,0 +1,357 @@
+import os
+import random
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from demand_zone.constituents import ConstituentStore
+from demand_zone.ratelimit import AdaptiveRateLimiter, ThrottledError, call_with_retry, is_transient
+from demand_zone.store import period_to_offset, trim_to_period
+
+METADATA_COLUMNS = ['market_cap', 'sector', 'shares_outstanding']
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+YFINANCE_PERIODS = {'1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd', 'max'}
+
+
+class MarketDataProvider(ABC):
+    """
+    Source of the ticker universe, daily OHLCV bars and company metadata
+    """
+
+    @abstractmethod
+    def fetch_universe(self):
+        """
+        Return the list of ticker symbols to screen
+        """
+
+    @abstractmethod
+    def fetch_bars(self, tickers, period=None, start=None):
+        """
+        Return a dict of ticker -> OHLCV DataFrame for the trailing period,
+        or for every bar on or after start when start is given
+        """
+
+    @abstractmethod
+    def fetch_metadata(self, tickers):
+        """
+        Return a DataFrame indexed by ticker with METADATA_COLUMNS
+        """
+
+    def stored_universe(self):
+        """
+        Return the persisted universe snapshot (a dict with tickers and
+        fetched_at) that can be served without a network request, or None
+        """
+        return None
+
+
+def split_batch_frame(frame, tickers, min_bars=30):
+    """
+    Split a combined multi-ticker download back into per-ticker OHLCV frames
+    """
+    split = {}
+    if frame is None or frame.empty:
+        return split
+
+    # Single-symbol downloads may come back without the ticker column level
+    if not isinstance(frame.columns, pd.MultiIndex):
+        if len(tickers) == 1:
+            frame = pd.concat({tickers[0]: frame}, axis=1)
+        else:
+            return split
+
+    available = set(frame.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+
+        # Tickers with shorter histories are NaN-padded on the shared index
+        data = frame[ticker].dropna(how='all')
+        if data.empty or len(data) < min_bars:
+            continue
+        split[ticker] = data
+
+    return split
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Live data from Yahoo Finance with the S&P 500 list scraped from Wikipedia
+    """
+
+    def __init__(self, timeout=10, constituents=None):
+        self.timeout = timeout
+        self.constituents = constituents if constituents is not None else ConstituentStore()
+
+    def fetch_universe(self):
+        return self.constituents.refresh(timeout=self.timeout)
+
+    def stored_universe(self):
+        return self.constituents.load()
+
+    def fetch_bars(self, tickers, period=None, start=None):
+        import yfinance as yf
+
+        tickers = list(tickers)
+        if start is None and period not in YFINANCE_PERIODS:
+            # Yahoo only accepts fixed ranges; express others as a start date
+            start = (pd.Timestamp.today().normalize() - period_to_offset(period)).strftime('%Y-%m-%d')
+        window = {'start': start} if start is not None else {'period': period}
+
+        if len(tickers) == 1:
+            data = yf.Ticker(tickers[0]).history(**window)
+            return {tickers[0]: data} if not data.empty else {}
+
+        frame = yf.download(
+            tickers,
+            group_by='ticker',
+            auto_adjust=True,
+            actions=False,
+            threads=False,
+            progress=False,
+            **window
+        )
+
+        # yf.download logs per-ticker failures instead of raising them
+        errors = getattr(getattr(yf, 'shared', None), '_ERRORS', {}) or {}
+        if any('rate limit' in str(errors.get(ticker, '')).lower() for ticker in tickers):
+            raise ThrottledError(f"Rate limited while downloading {len(tickers)} tickers")
+
+        return split_batch_frame(frame, tickers, min_bars=1)
+
+    def fetch_metadata(self, tickers):
+        import yfinance as yf
+
+        rows = {}
+        for ticker in tickers:
+            try:
+                info = yf.Ticker(ticker).info
+            except Exception as e:
+                # Throttling and network errors go up to the rate limiter and
+                # retries; anything else means no metadata for this ticker
+                if is_transient(e):
+                    raise
+                continue
+            rows[ticker] = {
+                'market_cap': info.get('marketCap'),
+                'sector': info.get('sector'),
+                'shares_outstanding': info.get('sharesOutstanding'),
+            }
+        return pd.DataFrame.from_dict(rows, orient='index', columns=METADATA_COLUMNS)
+
+
+class LocalProvider(MarketDataProvider):
+    """
+    Offline provider serving fixtures from a directory:
+    <TICKER>.parquet or <TICKER>.csv bars, plus optional universe.csv
+    (Symbol column) and metadata.csv (indexed by ticker)
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def fetch_universe(self):
+        universe_path = self.root / "universe.csv"
+        if universe_path.exists():
+            return pd.read_csv(universe_path)['Symbol'].astype(str).tolist()
+
+        symbols = {path.stem for path in self.root.iterdir() if path.suffix in ('.parquet', '.csv')}
+        symbols -= {'universe', 'metadata'}
+        return sorted(symbols)
+
+    def fetch_bars(self, tickers, period=None, start=None):
+        bars = {}
+        for ticker in tickers:
+            data = self._read_bars(ticker)
+            if data is None or data.empty:
+                continue
+            bars[ticker] = _window(data, period, start)
+        return bars
+
+    def fetch_metadata(self, tickers):
+        metadata_path = self.root / "metadata.csv"
+        if not metadata_path.exists():
+            return pd.DataFrame(columns=METADATA_COLUMNS)
+
+        metadata = pd.read_csv(metadata_path, index_col=0)
+        return metadata.reindex(index=list(tickers), columns=METADATA_COLUMNS).dropna(how='all')
+
+    def _read_bars(self, ticker):
+        parquet_path = self.root / f"{ticker}.parquet"
+        if parquet_path.exists():
+            return pd.read_parquet(parquet_path)
+
+        csv_path = self.root / f"{ticker}.csv"
+        if csv_path.exists():
+            return pd.read_csv(csv_path, index_col=0, parse_dates=True)
+
+        return None
+
+
+def generate_ohlcv(ticker, n_bars=252, end=None, seed=0, missing_rate=0.0):
+    """
+    Generate a deterministic random-walk OHLCV frame of business-day bars,
+    dropping about missing_rate of them at random to simulate data gaps
+    """
+    rng = np.random.default_rng([seed, zlib.crc32(ticker.encode())])
+    end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end)
+    index = pd.bdate_range(end=end, periods=n_bars)
+
+    start_price = rng.uniform(20, 500)
+    returns = rng.normal(0.0003, 0.02, n_bars)
+    close = start_price * np.exp(np.cumsum(returns))
+    open_ = close * (1 + rng.normal(0, 0.005, n_bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, n_bars)))
+    volume = rng.lognormal(np.log(3_000_000), 0.6, n_bars).round()
+
+    data = pd.DataFrame(
+        {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+        index=index
+    )
+    if missing_rate > 0:
+        data = data[rng.random(n_bars) >= missing_rate]
+    return data
+
+
+class SyntheticProvider(MarketDataProvider):
+    """
+    Offline provider that generates deterministic synthetic data per ticker,
+    optionally with about missing_rate of the bars missing
+    """
+
+    def __init__(self, n_tickers=500, n_bars=252, end=None, seed=0, missing_rate=0.0):
+        self.n_tickers = n_tickers
+        self.n_bars = n_bars
+        self.end = end
+        self.seed = seed
+        self.missing_rate = missing_rate
+
+    def fetch_universe(self):
+        return [f"SYN{i:05d}" for i in range(self.n_tickers)]
+
+    def fetch_bars(self, tickers, period=None, start=None):
+        return {
+            ticker: _window(generate_ohlcv(ticker, self.n_bars, self.end, self.seed, self.missing_rate), period, start)
+            for ticker in tickers
+        }
+
+    def fetch_metadata(self, tickers):
+        sectors = ['Technology', 'Health Care', 'Financials', 'Energy', 'Industrials', 'Utilities']
+        rows = {}
+        for ticker in tickers:
+            rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode()), 1])
+            shares = float(rng.integers(50_000_000, 5_000_000_000))
+            close = generate_ohlcv(ticker, self.n_bars, self.end, self.seed)['Close'].iloc[-1]
+            rows[ticker] = {
+                'market_cap': shares * close,
+                'sector': sectors[int(rng.integers(len(sectors)))],
+                'shares_outstanding': shares,
+            }
+        return pd.DataFrame.from_dict(rows, orient='index', columns=METADATA_COLUMNS)
+
+
+class LatencyProvider(MarketDataProvider):
+    """
+    Wraps another provider and sleeps before every call to mimic network
+    latency: latency seconds plus uniform jitter, and slow_latency for a
+    slow_rate fraction of requests
+    """
+
+    def __init__(self, provider, latency=0.05, jitter=0.02, slow_rate=0.0, slow_latency=1.0, seed=0):
+        self.provider = provider
+        self.latency = latency
+        self.jitter = jitter
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.requests = 0
+        self._random = random.Random(seed)
+
+    def _sleep(self):
+        self.requests += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if self._random.random() < self.slow_rate:
+            delay = self.slow_latency
+        time.sleep(delay)
+
+    def fetch_universe(self):
+        self._sleep()
+        return self.provider.fetch_universe()
+
+    def stored_universe(self):
+        return self.provider.stored_universe()
+
+    def fetch_bars(self, tickers, period=None, start=None):
+        self._sleep()
+        return self.provider.fetch_bars(tickers, period=period, start=start)
+
+    def fetch_metadata(self, tickers):
+        self._sleep()
+        return self.provider.fetch_metadata(tickers)
+
+
+class RateLimitedProvider(MarketDataProvider):
+    """
+    Wraps another provider so every call goes through a shared adaptive
+    rate limiter and transient failures are retried with jittered backoff
+    """
+
+    def __init__(self, provider, limiter=None, retries=3):
+        self.provider = provider
+        self.limiter = limiter if limiter is not None else AdaptiveRateLimiter()
+        self.retries = retries
+
+    def fetch_universe(self):
+        return call_with_retry(self.provider.fetch_universe, self.limiter, self.retries)
+
+    def stored_universe(self):
+        return self.provider.stored_universe()
+
+    def fetch_bars(self, tickers, period=None, start=None):
+        return call_with_retry(
+            lambda: self.provider.fetch_bars(tickers, period=period, start=start),
+            self.limiter,
+            self.retries
+        )
+
+    def fetch_metadata(self, tickers):
+        # Metadata costs one upstream request per ticker, so each ticker
+        # takes its own token and is retried on its own
+        frames = [
+            call_with_retry(lambda: self.provider.fetch_metadata([ticker]), self.limiter, self.retries)
+            for ticker in tickers
+        ]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=METADATA_COLUMNS)
+        return pd.concat(frames)
+
+
+def _window(data, period, start):
+    if start is not None:
+        start = pd.Timestamp(start)
+        if data.index.tz is not None and start.tz is None:
+            start = start.tz_localize(data.index.tz)
+        return data[data.index >= start]
+    if period is not None:
+        return trim_to_period(data, period)
+    return data
+
+
+def provider_from_env():
+    """
+    Build the provider selected by DEMAND_ZONE_PROVIDER (yfinance, local or
+    synthetic); local fixtures are read from DEMAND_ZONE_DATA_DIR
+    """
+    name = os.environ.get("DEMAND_ZONE_PROVIDER", "yfinance").lower()
+    if name == "local":
+        return LocalProvider(os.environ.get("DEMAND_ZONE_DATA_DIR", "fixtures"))
+    if name == "synthetic":
+        return SyntheticProvider()
+    return RateLimitedProvider(YFinanceProvider())
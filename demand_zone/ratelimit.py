@@ -0,0 +1,107 @@
+import random
+import threading
+import time
+
+
+class ThrottledError(Exception):
+    """
+    Raised when the upstream signals rate limiting (HTTP 429 or equivalent)
+    """
+
+
+def is_throttled(exc):
+    """
+    Whether an exception means the upstream is rate limiting us
+    """
+    if isinstance(exc, ThrottledError):
+        return True
+
+    response = getattr(exc, 'response', None)
+    if getattr(response, 'status_code', None) == 429:
+        return True
+
+    name = type(exc).__name__
+    message = str(exc).lower()
+    return 'RateLimit' in name or '429' in message or 'too many requests' in message or 'rate limit' in message
+
+
+def is_transient(exc):
+    """
+    Whether retrying the same request may succeed
+    """
+    if is_throttled(exc) or isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+
+    # requests/urllib3 network errors do not share a common builtin base
+    name = type(exc).__name__
+    return 'Timeout' in name or 'Connection' in name
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket shared by all fetch workers. The refill rate
+    grows additively after successful requests and is cut multiplicatively
+    when the upstream throttles, so it settles just under the allowed
+    ceiling instead of bursting into 429s.
+    """
+
+    def __init__(self, rate=5.0, burst=10, min_rate=0.5, max_rate=20.0, increase=0.1, decrease=0.5):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Block until a request token is available
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            # Drain the bucket so queued workers back off immediately
+            self._tokens = min(self._tokens, 0.0)
+
+
+def call_with_retry(func, limiter=None, retries=3, base_delay=0.5, max_delay=10.0):
+    """
+    Call func under the rate limiter, retrying transient failures with
+    exponential backoff and full jitter
+    """
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            result = func()
+        except Exception as e:
+            if limiter is not None and is_throttled(e):
+                limiter.on_throttle()
+            if attempt == retries or not is_transient(e):
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
+        else:
+            if limiter is not None:
+                limiter.on_success()
+            return result
@@ -0,0 +1,414 @@
+"""
+UI-free fetch -> indicators pipeline shared by the Streamlit app, the
+headless CLI and the benchmarks. Progress is reported through callbacks.
+"""
+import json
+import logging
+import math
+import time
+
+import pandas as pd
+
+from demand_zone.failures import (
+    EMPTY_DATA, INSUFFICIENT_BARS, MISSED_DEADLINE, NAN_INDICATORS, TIMEOUT, FailureReport
+)
+from demand_zone.fetch import REQUEST_TIMEOUT, SCAN_DEADLINE, iter_fetch_chunks
+from demand_zone.indicators import (
+    INDICATOR_COLUMNS, MIN_BARS, IndicatorState, compute_indicator_panel, compute_rsi, required_bars
+)
+from demand_zone.market_calendar import data_as_of, sessions_to_period
+from demand_zone.providers import provider_from_env
+from demand_zone.screen import format_indicator_rows, results_frame
+from demand_zone.store import covers_period, trim_to_period
+
+LOGGER = logging.getLogger("demand_zone.scan")
+
+# Number of tickers requested per batched download round trip
+BATCH_CHUNK_SIZE = 50
+
+# Requests in flight at once
+MAX_WORKERS = 10
+
+
+def screening_period():
+    """
+    Shortest fetch window that covers every screening indicator's lookback
+    """
+    return sessions_to_period(required_bars())
+
+
+def chunk_tickers(tickers, chunk_size):
+    """
+    Split a ticker list into consecutive chunks of at most chunk_size symbols
+    """
+    return [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+
+def streaming_chunk_size(n_tickers, max_workers=MAX_WORKERS, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Chunk size that spreads n_tickers over at least max_workers requests,
+    capped at chunk_size, so partial results arrive chunk by chunk instead
+    of all at once for a small universe
+    """
+    return max(1, min(chunk_size, math.ceil(n_tickers / max_workers)))
+
+
+def fetch_stock_data(ticker, period, store, provider, single_flight=None, failures=None):
+    """
+    Fetch stock data for a given ticker. With a SingleFlight, concurrent
+    requests for the same ticker and period, e.g. from several sessions,
+    share one download.
+    """
+    if single_flight is None:
+        return download_stock_data(ticker, period, store, provider, failures)
+    return single_flight.do(
+        (ticker, period),
+        lambda: download_stock_data(ticker, period, store, provider, failures)
+    )
+
+
+def download_stock_data(ticker, period, store, provider, failures=None):
+    """
+    Download stock data for a given ticker. With a store, only bars after the
+    last stored date are requested, nothing is requested while the stored
+    bars are still current per the market calendar, and the stored history
+    is served if the upstream is unreachable. When no usable bars come back,
+    the reason is recorded in failures.
+    """
+    stored = store.read(ticker) if store is not None else None
+    error = None
+
+    try:
+        if covers_period(stored, period) and store.is_fresh(ticker):
+            data = trim_to_period(stored, period)
+        elif covers_period(stored, period):
+            bars = provider.fetch_bars([ticker], start=stored.index[-1].strftime('%Y-%m-%d')).get(ticker)
+            data = trim_to_period(store.append(ticker, bars), period)
+            _touch_returned(store, [ticker], {ticker: bars})
+        else:
+            data = provider.fetch_bars([ticker], period=period).get(ticker)
+            if store is not None:
+                data = trim_to_period(store.append(ticker, data), period)
+
+    except Exception as e:
+        error = e
+        data = trim_to_period(stored, period)
+
+    if data is None or data.empty or len(data) < MIN_BARS:
+        if failures is not None:
+            _record_missing(failures, ticker, data, error)
+        return None
+
+    return data
+
+
+def fetch_stock_data_batch(tickers, period, store, provider, single_flight=None, failures=None):
+    """
+    Fetch stock data for many tickers in a single request. With a
+    SingleFlight, tickers already being downloaded for the same period by
+    another session are awaited instead of requested again.
+    """
+    if single_flight is None:
+        return download_stock_data_batch(tickers, period, store, provider, failures)
+
+    errors = {}
+    fetched = single_flight.do_many(
+        [(ticker, period) for ticker in tickers],
+        lambda keys: {
+            (ticker, period): data
+            for ticker, data in download_stock_data_batch(
+                [ticker for ticker, _ in keys], period, store, provider, failures
+            ).items()
+        },
+        errors
+    )
+    # Another session's download failed for these; keep its reason
+    if failures is not None:
+        for (ticker, _), exc in errors.items():
+            failures.add_exception([ticker], exc)
+    return {ticker: data for (ticker, _), data in fetched.items() if data is not None}
+
+
+def download_stock_data_batch(tickers, period, store, provider, failures=None):
+    """
+    Download stock data for many tickers in a single request. With a store,
+    tickers that already have history are topped up from their oldest
+    last-stored date in a second request instead of re-downloading the
+    full period, and tickers whose stored bars are still current per the
+    market calendar are not requested at all. Tickers without usable bars
+    are recorded in failures with the reason.
+    """
+    tickers = list(tickers)
+    stored = {ticker: store.read(ticker) for ticker in tickers} if store is not None else {}
+
+    covered = [ticker for ticker in tickers if covers_period(stored.get(ticker), period)]
+    incremental = [ticker for ticker in covered if not store.is_fresh(ticker)]
+    full = [ticker for ticker in tickers if ticker not in covered]
+
+    batches = []
+    if full:
+        batches.append((full, {'period': period}))
+    if incremental:
+        start = min(stored[ticker].index[-1].strftime('%Y-%m-%d') for ticker in incremental)
+        batches.append((incremental, {'start': start}))
+
+    fetched = {}
+    errors = {}
+    for group, window in batches:
+        try:
+            bars = provider.fetch_bars(group, **window)
+            fetched.update(bars)
+            if store is not None:
+                _touch_returned(store, group, bars)
+        except Exception as e:
+            errors.update(dict.fromkeys(group, e))
+
+    # Merge into the store; tickers the upstream failed on fall back to it
+    results = {}
+    for ticker in tickers:
+        data = fetched.get(ticker)
+        if store is not None:
+            data = trim_to_period(store.append(ticker, data), period)
+        if data is not None and not data.empty and len(data) >= MIN_BARS:
+            results[ticker] = data
+        elif failures is not None:
+            _record_missing(failures, ticker, data, errors.get(ticker))
+
+    return results
+
+
+def _touch_returned(store, tickers, bars):
+    # Only tickers that came back were checked upstream; a top-up from the
+    # last stored date always includes that bar, so an omitted ticker failed
+    # silently and must stay stale
+    for ticker in tickers:
+        data = bars.get(ticker)
+        if data is not None and not data.empty:
+            store.touch(ticker)
+
+
+def _record_missing(failures, ticker, data, error):
+    if data is None or data.empty:
+        if error is not None:
+            failures.add_exception([ticker], error)
+        else:
+            failures.add([ticker], EMPTY_DATA, "no bars returned")
+    else:
+        failures.add([ticker], INSUFFICIENT_BARS, f"{len(data)} of {MIN_BARS} bars")
+
+
+def calculate_indicators(df, ticker=None, state=None):
+    """
+    Calculate technical indicators for the given dataframe. Errors are
+    logged with the ticker and yield None, like a short history does. With
+    an IndicatorState, only bars after the state's last committed date are
+    processed, so a refresh costs constant time per new bar.
+    """
+    try:
+        # Resume from saved state
+        if state is not None:
+            if len(df) < MIN_BARS:
+                return None
+            indicators = state.advance(df)
+            if indicators is None or any(pd.isna(value) for value in indicators.values()):
+                return None
+            return indicators
+
+        # Check if we have enough data
+        if len(df) < MIN_BARS:
+            return None
+
+        # RSI
+        rsi = pd.Series(compute_rsi(df['Close'].to_numpy(dtype=float), window=14), index=df.index)
+
+        # 30-day low
+        low_30d = df['Low'].rolling(window=30).min()
+
+        # Distance from 30-day low
+        distance_from_low = ((df['Close'] - low_30d) / low_30d) * 100
+
+        # Weekly change (5-day)
+        weekly_change = ((df['Close'] - df['Close'].shift(5)) / df['Close'].shift(5)) * 100
+
+        # Monthly change (21-day)
+        monthly_change = ((df['Close'] - df['Close'].shift(21)) / df['Close'].shift(21)) * 100
+
+        indicators = {
+            'rsi': rsi.iloc[-1],
+            'distance_from_low': distance_from_low.iloc[-1],
+            'weekly_change': weekly_change.iloc[-1],
+            'monthly_change': monthly_change.iloc[-1],
+            'volume': df['Volume'].iloc[-1],
+            'close': df['Close'].iloc[-1],
+            'low_30d': low_30d.iloc[-1]
+        }
+        if any(pd.isna(value) for value in indicators.values()):
+            return None
+        return indicators
+
+    except Exception as e:
+        LOGGER.warning(json.dumps({
+            'event': 'indicators_failed',
+            'ticker': ticker,
+            'error': f"{type(e).__name__}: {e}"[:200],
+        }))
+        return None
+
+
+def calculate_indicators_incremental(price_data, store):
+    """
+    Advance each ticker's saved indicator state with its new bars. Returns
+    the same table compute_indicator_panel would for these bars.
+    """
+    rows = {}
+    for ticker, data in price_data.items():
+        state = store.load_state(ticker) or IndicatorState()
+        indicators = calculate_indicators(data, ticker, state)
+        store.save_state(ticker, state)
+        if indicators is not None:
+            rows[ticker] = indicators
+
+    table = pd.DataFrame.from_dict(rows, orient='index', columns=INDICATOR_COLUMNS)
+    table.index.name = 'Ticker'
+    return table
+
+
+def iter_scan_rows(tickers, period=None, max_workers=MAX_WORKERS, chunk_size=BATCH_CHUNK_SIZE, store=None,
+                   provider=None, single_flight=None, engine="asyncio", request_timeout=REQUEST_TIMEOUT,
+                   deadline=SCAN_DEADLINE, timings=None, failures=None):
+    """
+    Fetch stocks concurrently and yield (chunk, rows) as each chunk of
+    tickers completes, computing its indicators right away. The period
+    defaults to screening_period() and the provider to provider_from_env().
+    With a Timings, each chunk's fetch and indicator time is recorded, and
+    every ticker gets the time its chunk took to arrive.
+    With a store, each ticker's saved IndicatorState is advanced instead of
+    recomputing its window. With a FailureReport, every ticker that yields
+    no row is recorded with its reason. The generator returns the FetchResult once every chunk is
+    done.
+    """
+    if period is None:
+        period = screening_period()
+    if provider is None:
+        provider = provider_from_env()
+
+    if chunk_size and chunk_size > 1:
+        chunks = chunk_tickers(list(tickers), chunk_size)
+        fetch_chunk = lambda chunk: fetch_stock_data_batch(chunk, period, store, provider, single_flight, failures)
+    else:
+        chunks = [[ticker] for ticker in tickers]
+        fetch_chunk = lambda chunk: fetch_stock_data(chunk[0], period, store, provider, single_flight, failures)
+
+    if timings is not None:
+        fetch_chunk = _timed_fetch(fetch_chunk, timings)
+
+    if engine == "asyncio":
+        options = {'concurrency': max_workers, 'request_timeout': request_timeout, 'deadline': deadline}
+    else:
+        options = {'max_workers': max_workers}
+
+    succeeded = set()
+    stream = iter_fetch_chunks(chunks, fetch_chunk, engine=engine, **options)
+    while True:
+        try:
+            chunk, price_data = next(stream)
+        except StopIteration as done:
+            if failures is not None:
+                _record_unfetched(failures, tickers, succeeded, done.value)
+            return done.value
+
+        start = time.perf_counter()
+        if store is not None:
+            indicators = calculate_indicators_incremental(price_data, store)
+        else:
+            # Indicators for the chunk in one vectorized pass
+            indicators = compute_indicator_panel(price_data)
+        rows = format_indicator_rows(indicators)
+        if timings is not None:
+            timings.record('indicators', time.perf_counter() - start, tickers=len(chunk))
+
+        succeeded.update(indicators.index)
+        if failures is not None:
+            failures.add(
+                [ticker for ticker in price_data if ticker not in indicators.index],
+                NAN_INDICATORS, "latest indicator values are NaN"
+            )
+        yield chunk, rows
+
+
+def _record_unfetched(failures, tickers, succeeded, fetched):
+    # Engine-level outcomes override whatever a cut-off download recorded
+    failures.add(fetched.timed_out, TIMEOUT, "request timed out")
+    failures.add(fetched.missed_deadline, MISSED_DEADLINE, "scan deadline passed")
+    for ticker, exc in fetched.errors.items():
+        failures.add_exception([ticker], exc)
+
+    # Tickers another session downloaded for us come back without a reason
+    recorded = failures.to_dict()
+    failures.add(
+        [ticker for ticker in tickers if ticker not in succeeded and ticker not in recorded],
+        EMPTY_DATA, "no bars returned"
+    )
+
+
+def _timed_fetch(fetch_chunk, timings):
+    def fetch(chunk):
+        start = time.perf_counter()
+        try:
+            return fetch_chunk(chunk)
+        finally:
+            elapsed = time.perf_counter() - start
+            timings.record('fetch', elapsed, tickers=len(chunk))
+            # A ticker's data is ready when its whole chunk is
+            timings.record_tickers(chunk, elapsed)
+    return fetch
+
+
+def scan_stocks(tickers, on_progress=None, on_rows=None, **scan_options):
+    """
+    Fetch and compute indicators for stocks with concurrent processing.
+    on_progress(chunk) is called as chunks finish and on_rows(rows) with
+    every row accumulated so far, so callers can render partial results;
+    with either callback the universe is split into streaming_chunk_size()
+    chunks. scan_options are passed to iter_scan_rows(). The returned table's
+    attrs['incomplete'] is set when tickers were dropped because of a
+    request timeout or the scan deadline, and attrs['failures'] maps every
+    ticker without a row to its failure reason.
+    """
+    if on_progress is not None or on_rows is not None:
+        scan_options['chunk_size'] = streaming_chunk_size(
+            len(tickers),
+            scan_options.get('max_workers', MAX_WORKERS),
+            scan_options.get('chunk_size', BATCH_CHUNK_SIZE)
+        )
+    if scan_options.get('failures') is None:
+        scan_options['failures'] = FailureReport()
+    failures = scan_options['failures']
+    timings = scan_options.get('timings')
+    as_of = data_as_of()
+    results = []
+
+    stream = iter_scan_rows(tickers, **scan_options)
+    while True:
+        try:
+            chunk, rows = next(stream)
+        except StopIteration as done:
+            fetched = done.value
+            break
+
+        results.extend(rows)
+        if on_progress is not None:
+            on_progress(chunk)
+        if on_rows is not None and rows:
+            on_rows(results)
+
+    start = time.perf_counter()
+    table = results_frame(results)
+    if timings is not None:
+        timings.record('build_table', time.perf_counter() - start, rows=len(table))
+    table.attrs['as_of'] = as_of
+    table.attrs['incomplete'] = fetched.incomplete
+    table.attrs['unfetched'] = fetched.timed_out + fetched.missed_deadline
+    table.attrs['failures'] = failures.to_dict()
+    failures.log()
+    return table
@@ -0,0 +1,48 @@
+import pandas as pd
+
+# Sidebar defaults, shared with the headless CLI
+DEFAULT_RSI_THRESHOLD = 40
+DEFAULT_DISTANCE_THRESHOLD = 5
+DEFAULT_VOLUME_THRESHOLD = 1_000_000
+
+RESULT_COLUMNS = ['Ticker', 'Weekly_%', 'Monthly_%', 'RSI', 'Distance_from_Low_%', 'Volume', 'Close', 'Low_30d']
+
+
+def format_indicator_rows(indicators):
+    """
+    Turn an indicator frame indexed by ticker into display-ready result rows
+    """
+    rows = []
+    for ticker, row in indicators.iterrows():
+        rows.append({
+            'Ticker': ticker,
+            'Weekly_%': round(row['weekly_change'], 2),
+            'Monthly_%': round(row['monthly_change'], 2),
+            'RSI': round(row['rsi'], 2),
+            'Distance_from_Low_%': round(row['distance_from_low'], 2),
+            'Volume': int(row['volume']),
+            'Close': round(row['close'], 2),
+            'Low_30d': round(row['low_30d'], 2)
+        })
+    return rows
+
+
+def screen_stocks(df_results, rsi_threshold=DEFAULT_RSI_THRESHOLD, distance_threshold=DEFAULT_DISTANCE_THRESHOLD,
+                  volume_threshold=DEFAULT_VOLUME_THRESHOLD):
+    """
+    Flag demand zone stocks in an indicator table with a vectorized mask
+    """
+    screened = df_results.copy()
+    screened['In_Demand_Zone'] = (
+        (screened['RSI'] <= rsi_threshold) &
+        (screened['Distance_from_Low_%'] <= distance_threshold) &
+        (screened['Volume'] >= volume_threshold)
+    )
+    return screened
+
+
+def results_frame(rows):
+    """
+    Build a result table from rows, keeping the columns when rows is empty
+    """
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
@@ -0,0 +1,203 @@
+import json
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from demand_zone.indicators import IndicatorState
+from demand_zone.market_calendar import MARKET_TZ, fresh_until
+
+LOGGER = logging.getLogger("demand_zone.store")
+
+DEFAULT_STORE_DIR = Path(os.environ.get("DEMAND_ZONE_STORE", ".ohlcv_store"))
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+
+def period_to_offset(period):
+    """
+    Convert a yfinance period string such as "3mo" into a pandas DateOffset
+    """
+    match = _PERIOD_PATTERN.match(period)
+    if match is None:
+        return None
+
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return pd.DateOffset(days=count)
+    if unit == "wk":
+        return pd.DateOffset(weeks=count)
+    if unit == "mo":
+        return pd.DateOffset(months=count)
+    return pd.DateOffset(years=count)
+
+
+def trim_to_period(df, period):
+    """
+    Keep only the bars that fall inside the trailing period window
+    """
+    offset = period_to_offset(period)
+    if df is None or df.empty or offset is None:
+        return df
+
+    cutoff = df.index[-1] - offset
+    return df[df.index > cutoff]
+
+
+def covers_period(df, period, slack_days=7):
+    """
+    Check whether stored bars reach back far enough to serve the period
+    """
+    offset = period_to_offset(period)
+    if df is None or df.empty or offset is None:
+        return False
+
+    # Allow for weekends and holidays at the start of the window
+    return df.index[0] <= df.index[-1] - offset + pd.Timedelta(days=slack_days)
+
+
+class OHLCVStore:
+    """
+    Parquet-backed per-ticker OHLCV store that only grows by appending new bars
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, ticker):
+        return self.root / f"{ticker}.parquet"
+
+    def read(self, ticker):
+        """
+        Return the stored bars for a ticker, or None if nothing is stored
+        """
+        path = self.path(ticker)
+        if not path.exists():
+            return None
+
+        try:
+            data = pd.read_parquet(path)
+        except Exception as e:
+            log_unreadable(path, e)
+            return None
+
+        return data if not data.empty else None
+
+    def fetched_at(self, ticker):
+        """
+        When the upstream was last successfully queried for a ticker
+        """
+        path = self.path(ticker)
+        if not path.exists():
+            return None
+        return pd.Timestamp(path.stat().st_mtime, unit='s', tz='UTC').tz_convert(MARKET_TZ)
+
+    def touch(self, ticker):
+        """
+        Record a successful upstream check that brought no new bars
+        """
+        path = self.path(ticker)
+        if path.exists():
+            os.utime(path)
+
+    def is_fresh(self, ticker, now=None):
+        """
+        Whether the stored bars are still current per the market calendar,
+        so the upstream cannot have anything newer yet
+        """
+        fetched_at = self.fetched_at(ticker)
+        if fetched_at is None:
+            return False
+        now = pd.Timestamp.now(tz=MARKET_TZ) if now is None else now
+        return now < fresh_until(fetched_at)
+
+    def append(self, ticker, new_bars):
+        """
+        Merge new bars into the stored history and return the combined frame.
+        Overlapping dates are replaced by the newer bars, so the last
+        (possibly still forming) session is refreshed on every update.
+        """
+        stored = self.read(ticker)
+        if new_bars is None or new_bars.empty:
+            return stored
+
+        if stored is not None:
+            new_bars = _match_timezone(new_bars, stored.index.tz)
+            combined = pd.concat([stored, new_bars])
+            combined = combined[~combined.index.duplicated(keep='last')].sort_index()
+        else:
+            combined = new_bars.sort_index()
+
+        self._write(ticker, combined)
+        return combined
+
+    def state_path(self, ticker):
+        return self.root / f"{ticker}.state.json"
+
+    def load_state(self, ticker):
+        """
+        Return the saved IndicatorState for a ticker, or None
+        """
+        path = self.state_path(ticker)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path) as handle:
+                return IndicatorState.from_dict(json.load(handle))
+        except Exception as e:
+            log_unreadable(path, e)
+            return None
+
+    def save_state(self, ticker, state):
+        atomic_write(
+            self.state_path(ticker),
+            lambda tmp_path: Path(tmp_path).write_text(json.dumps(state.to_dict()))
+        )
+
+    def _write(self, ticker, data):
+        atomic_write(self.path(ticker), data.to_parquet)
+
+
+def atomic_write(path, writer):
+    """
+    Call writer(tmp_path) on a temporary file next to path and move it into
+    place, so readers never see a partial file; the temporary file is
+    removed if writing fails
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def log_unreadable(path, exc):
+    """
+    Log a stored file that could not be read and is treated as missing
+    """
+    LOGGER.warning(json.dumps({
+        'event': 'unreadable_file',
+        'path': str(path),
+        'error': f"{type(exc).__name__}: {exc}"[:200],
+    }))
+
+
+def _match_timezone(df, tz):
+    # Single-ticker and batch downloads disagree on index timezones
+    if df.index.tz is None and tz is not None:
+        return df.tz_localize(tz)
+    if df.index.tz is not None and tz is None:
+        return df.tz_localize(None)
+    if df.index.tz is not None:
+        return df.tz_convert(tz)
+    return df
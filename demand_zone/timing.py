@@ -0,0 +1,110 @@
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+LOGGER = logging.getLogger("demand_zone.timing")
+
+
+class Timings:
+    """
+    Thread-safe per-stage span timings and per-ticker fetch latencies. Each
+    stage keeps its last max_samples durations for p50/p95/max, and every
+    sample is also emitted as a one-line JSON log record: spans at INFO,
+    per-ticker latencies at DEBUG.
+    """
+
+    def __init__(self, max_samples=1000, logger=LOGGER):
+        self.max_samples = max_samples
+        self.logger = logger
+        self._stages = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._tickers = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage, **fields):
+        """
+        Time the enclosed block as one sample of stage
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, **fields)
+
+    def record(self, stage, seconds, **fields):
+        with self._lock:
+            self._stages[stage].append(seconds)
+        self._log(logging.INFO, 'span', stage=stage, ms=round(seconds * 1000, 3), **fields)
+
+    def record_tickers(self, tickers, seconds):
+        """
+        Record, for each ticker, how long the request that carried it took
+        to finish, along with how many tickers that request held
+        """
+        with self._lock:
+            for ticker in tickers:
+                self._tickers[ticker] = (seconds, len(tickers))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for ticker in tickers:
+                self._log(logging.DEBUG, 'ticker', ticker=ticker, ms=round(seconds * 1000, 3), batch=len(tickers))
+
+    def summary(self):
+        """
+        DataFrame indexed by stage with count, p50_ms, p95_ms and max_ms
+        """
+        with self._lock:
+            samples = {stage: np.array(values) * 1000 for stage, values in self._stages.items() if values}
+
+        rows = {
+            stage: {
+                'count': len(values),
+                'p50_ms': np.percentile(values, 50),
+                'p95_ms': np.percentile(values, 95),
+                'max_ms': values.max(),
+            }
+            for stage, values in samples.items()
+        }
+        return pd.DataFrame.from_dict(rows, orient='index', columns=['count', 'p50_ms', 'p95_ms', 'max_ms'])
+
+    def totals(self):
+        """
+        Total recorded seconds per stage over the retained samples
+        """
+        with self._lock:
+            return {stage: float(sum(values)) for stage, values in self._stages.items()}
+
+    def slowest_tickers(self, n=10):
+        """
+        The n tickers whose data took longest to arrive, with the size of
+        the request that fetched each one
+        """
+        with self._lock:
+            latencies = dict(self._tickers)
+        slowest = sorted(latencies.items(), key=lambda item: item[1][0], reverse=True)[:n]
+        return pd.DataFrame({
+            'Ticker': [ticker for ticker, _ in slowest],
+            'ms': [seconds * 1000 for _, (seconds, _) in slowest],
+            'batch': [batch for _, (_, batch) in slowest],
+        })
+
+    def log_summary(self):
+        for stage, row in self.summary().iterrows():
+            self._log(
+                logging.INFO, 'summary', stage=stage, count=int(row['count']),
+                p50_ms=round(row['p50_ms'], 3), p95_ms=round(row['p95_ms'], 3), max_ms=round(row['max_ms'], 3)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._stages.clear()
+            self._tickers.clear()
+
+    def _log(self, level, event, **fields):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, json.dumps({'event': event, **fields}, default=str))
@@ -1,27 +1,30 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import yfinance as yf
-import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
-from ta.trend import SMAIndicator
-from ta.momentum import RSIIndicator
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import warnings
+from demand_zone.cache import BackgroundJobs, ResultCache, SingleFlight, SnapshotStore
+from demand_zone.constituents import FALLBACK_TICKERS, is_stale
+from demand_zone.failures import failure_counts
+from demand_zone.indicators import indicator_series
+from demand_zone.market_calendar import data_as_of, fresh_until
+from demand_zone.metadata import MetadataIndex, top_by_market_cap
+from demand_zone.providers import provider_from_env
+from demand_zone.scan import fetch_stock_data, scan_stocks, screening_period
+from demand_zone.screen import (
+    DEFAULT_DISTANCE_THRESHOLD, DEFAULT_RSI_THRESHOLD, DEFAULT_VOLUME_THRESHOLD, screen_stocks
+)
+from demand_zone.store import OHLCVStore, covers_period, trim_to_period
+from demand_zone.timing import Timings
 warnings.filterwarnings('ignore')
 
-# Page configuration
-st.set_page_config(
-    page_title="S&P 500 Demand Zone Analyzer",
-    page_icon="📈",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Charts show more history than screening needs
+CHART_PERIOD = "3mo"
+
+# Partial scans are reused briefly so widget changes do not rescan inline
+PARTIAL_RESULT_TTL = 60
 
 # Custom CSS for better styling
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -45,178 +48,222 @@ st.markdown("""
         border-left-color: #dc3545;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def configure_page():
+    """
+    Page configuration and custom CSS; must run before any other st call
+    """
+    st.set_page_config(
+        page_title="S&P 500 Demand Zone Analyzer",
+        page_icon="📈",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+@st.cache_resource
+def get_data_provider():
+    """
+    Market data provider selected by the DEMAND_ZONE_PROVIDER environment variable
+    """
+    return provider_from_env()
+
+@st.cache_resource
+def get_single_flight():
+    """
+    Process-wide registry of in-flight downloads shared by all sessions
+    """
+    return SingleFlight()
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def fetch_sp500_tickers():
     """
-    Fetch S&P 500 ticker symbols from Wikipedia with fallback
+    Fetch S&P 500 ticker symbols from Wikipedia with fallback. A persisted
+    constituent snapshot is served immediately and revalidated in the
+    background once it is stale, so the list never blocks the screen.
     """
+    provider = get_data_provider()
+    snapshot = provider.stored_universe()
+    if snapshot:
+        if is_stale(snapshot):
+            get_background_jobs().run("sp500-constituents", provider.fetch_universe)
+
+        as_of = pd.Timestamp(snapshot['fetched_at']).strftime('%Y-%m-%d')
+        st.success(f"✅ Loaded {len(snapshot['tickers'])} S&P 500 tickers (constituent list as of {as_of})")
+        return snapshot['tickers']
+
     try:
-        # Primary method: Wikipedia
-        url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        # Parse the table
-        tables = pd.read_html(response.text)
-        sp500_table = tables[0]  # First table contains the S&P 500 data
+        # Primary method: the configured provider (Wikipedia for yfinance)
+        tickers = provider.fetch_universe()
         
-        # Extract ticker symbols
-        tickers = sp500_table['Symbol'].tolist()
-        
-        # Clean tickers (remove any special characters)
-        tickers = [ticker.strip().replace('.', '-') for ticker in tickers if ticker.strip()]
-        
-        st.success(f"✅ Successfully fetched {len(tickers)} S&P 500 tickers from Wikipedia")
+        st.success(f"✅ Successfully fetched {len(tickers)} S&P 500 tickers")
         return tickers
         
     except Exception as e:
-        st.warning(f"⚠️ Failed to fetch from Wikipedia: {str(e)}")
+        st.warning(f"⚠️ Failed to fetch ticker list: {str(e)}")
         
         # Fallback: Use a predefined list of major S&P 500 stocks
-        fallback_tickers = [
-            'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'BRK-B', 'LLY', 'V', 'TSM',
-            'UNH', 'XOM', 'JPM', 'JNJ', 'PG', 'MA', 'HD', 'CVX', 'AVGO', 'KO',
-            'PEP', 'COST', 'MRK', 'ABBV', 'BAC', 'PFE', 'TMO', 'ACN', 'DHR', 'VZ',
-            'ADBE', 'NFLX', 'CRM', 'CMCSA', 'DIS', 'NEE', 'PM', 'TXN', 'RTX', 'QCOM',
-            'HON', 'LOW', 'UPS', 'IBM', 'INTU', 'MS', 'SPGI', 'GS', 'CAT', 'DE'
-        ]
-        st.info(f"🔄 Using fallback list of {len(fallback_tickers)} major S&P 500 stocks")
-        return fallback_tickers
+        st.info(f"🔄 Using fallback list of {len(FALLBACK_TICKERS)} major S&P 500 stocks")
+        return FALLBACK_TICKERS
 
-def fetch_stock_data(ticker, period="3mo"):
+def analyze_stocks(tickers, **scan_options):
     """
-    Fetch stock data for a given ticker
+    Run scan_stocks() with a spinner and progress bar
     """
-    try:
-        stock = yf.Ticker(ticker)
-        data = stock.history(period=period)
+    with st.spinner("🔄 Fetching and analyzing stock data..."):
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        completed = 0
         
-        if data.empty or len(data) < 30:
-            return None
-            
-        return data
+        def update_progress(chunk):
+            nonlocal completed
+            completed += len(chunk)
+            progress_bar.progress(completed / len(tickers))
+            status_text.text(f"Processed {completed}/{len(tickers)} stocks...")
         
-    except Exception as e:
-        return None
+        table = scan_stocks(tickers, on_progress=update_progress, **scan_options)
+        
+        progress_bar.empty()
+        status_text.empty()
+    
+    return table
 
-def calculate_indicators(df):
+@st.cache_resource
+def get_price_store():
     """
-    Calculate technical indicators for the given dataframe
+    Shared on-disk OHLCV store reused across reruns and sessions
     """
-    try:
-        # Check if we have enough data
-        if len(df) < 30:
-            return None
-            
-        # RSI
-        rsi_indicator = RSIIndicator(close=df['Close'], window=14)
-        rsi = rsi_indicator.rsi()
-        
-        # 30-day low
-        low_30d = df['Low'].rolling(window=30).min()
-        
-        # Distance from 30-day low
-        distance_from_low = ((df['Close'] - low_30d) / low_30d) * 100
-        
-        # Weekly change (5-day)
-        weekly_change = ((df['Close'] - df['Close'].shift(5)) / df['Close'].shift(5)) * 100
-        
-        # Monthly change (21-day)
-        monthly_change = ((df['Close'] - df['Close'].shift(21)) / df['Close'].shift(21)) * 100
-        
-        # Latest values with NaN checks
-        latest_rsi = rsi.iloc[-1]
-        latest_distance = distance_from_low.iloc[-1]
-        latest_weekly = weekly_change.iloc[-1]
-        latest_monthly = monthly_change.iloc[-1]
-        latest_volume = df['Volume'].iloc[-1]
-        latest_close = df['Close'].iloc[-1]
-        latest_low_30d = low_30d.iloc[-1]
-        
-        # Check for NaN values
-        if (pd.isna(latest_rsi) or pd.isna(latest_distance) or 
-            pd.isna(latest_weekly) or pd.isna(latest_monthly) or
-            pd.isna(latest_volume) or pd.isna(latest_close) or
-            pd.isna(latest_low_30d)):
-            return None
-        
-        return {
-            'rsi': latest_rsi,
-            'distance_from_low': latest_distance,
-            'weekly_change': latest_weekly,
-            'monthly_change': latest_monthly,
-            'volume': latest_volume,
-            'close': latest_close,
-            'low_30d': latest_low_30d,
-            'data': df
-        }
-        
-    except Exception as e:
-        return None
+    return OHLCVStore()
+
+@st.cache_resource
+def get_result_cache():
+    """
+    Process-wide indicator table cache shared by reruns and browser sessions
+    """
+    return ResultCache()
+
+@st.cache_resource
+def get_snapshot_store():
+    """
+    Last completed scan per universe, served while a newer one is computed
+    """
+    return SnapshotStore()
 
-def analyze_stocks(tickers, rsi_threshold, distance_threshold, volume_threshold, max_workers=10):
+@st.cache_resource
+def get_background_jobs():
     """
-    Analyze stocks with concurrent processing
+    Maintenance jobs (constituent list, metadata index) run off the page,
+    kept apart from the per-universe scan snapshots
     """
-    results = []
+    return BackgroundJobs()
+
+@st.cache_resource
+def get_metadata_index():
+    """
+    Process-wide market cap and sector index persisted next to the price store
+    """
+    return MetadataIndex()
+
+@st.cache_resource
+def get_timings():
+    """
+    Process-wide stage and ticker timings behind the Performance panel
+    """
+    return Timings()
+
+def select_top_tickers(tickers, top_n):
+    """
+    The top_n tickers by market cap from the metadata index. Stale or missing
+    metadata is refreshed on a background thread; until it lands, tickers
+    without a market cap keep their universe order.
+    """
+    index = get_metadata_index()
+    metadata = index.read()
+    if index.refresh_due(tickers, metadata):
+        provider = get_data_provider()
+        get_background_jobs().run("metadata-index", lambda: index.refresh(provider, tickers))
     
-    with st.spinner("🔄 Fetching and analyzing stock data..."):
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_ticker = {executor.submit(fetch_stock_data, ticker): ticker for ticker in tickers}
-            
-            completed = 0
-            for future in as_completed(future_to_ticker):
-                ticker = future_to_ticker[future]
-                completed += 1
-                
-                try:
-                    data = future.result()
-                    if data is not None:
-                        indicators = calculate_indicators(data)
-                        if indicators is not None:
-                            # Check if in demand zone
-                            in_demand_zone = (
-                                indicators['rsi'] <= rsi_threshold and
-                                indicators['distance_from_low'] <= distance_threshold and
-                                indicators['volume'] >= volume_threshold
-                            )
-                            
-                            results.append({
-                                'Ticker': ticker,
-                                'Weekly_%': round(indicators['weekly_change'], 2),
-                                'Monthly_%': round(indicators['monthly_change'], 2),
-                                'RSI': round(indicators['rsi'], 2),
-                                'Distance_from_Low_%': round(indicators['distance_from_low'], 2),
-                                'Volume': int(indicators['volume']),
-                                'Close': round(indicators['close'], 2),
-                                'Low_30d': round(indicators['low_30d'], 2),
-                                'In_Demand_Zone': in_demand_zone,
-                                'data': indicators['data']
-                            })
-                
-                except Exception as e:
-                    pass
-                
-                # Update progress
-                progress = completed / len(tickers)
-                progress_bar.progress(progress)
-                status_text.text(f"Processed {completed}/{len(tickers)} stocks...")
-        
-        progress_bar.empty()
-        status_text.empty()
+    return top_by_market_cap(tickers, metadata, top_n)
+
+def load_indicator_table(tickers, period=None, on_rows=None):
+    """
+    Build the indicator table for a universe, cached by tickers, period and
+    data-as-of time only so threshold changes never trigger a re-fetch.
+    The period defaults to the window the indicators need. Once any scan of
+    the universe has completed, an outdated table is served immediately
+    (its attrs['as_of'] says how old it is) while a background thread
+    refreshes it. When a scan has to run inline, on_rows(rows) receives the
+    rows accumulated so far as each chunk of tickers completes.
+    """
+    if period is None:
+        period = screening_period()
+    universe = tuple(tickers)
+    key = (universe, period, data_as_of())
+    cache = get_result_cache()
+    snapshots = get_snapshot_store()
+    store = get_price_store()
+    provider = get_data_provider()
+    single_flight = get_single_flight()
+    timings = get_timings()
+    
+    table = cache.get(key)
+    if table is not None:
+        return table
+    
+    def publish(table, expires_at):
+        # Partial scans are cached only briefly and never become the
+        # snapshot, so a rescan soon retries the tickers that were skipped
+        if table.attrs.get('incomplete'):
+            cache.put(key, table, expires_at=min(expires_at, time.time() + PARTIAL_RESULT_TTL))
+        else:
+            cache.put(key, table, expires_at=expires_at)
+            snapshots.publish(universe, table)
+        return table
     
-    return results
+    snapshot = snapshots.latest(universe)
+    if snapshot is not None:
+        expires_at = fresh_until().timestamp()
+        snapshots.refresh(universe, lambda: publish(
+            scan_stocks(
+                list(tickers), period=period, store=store, provider=provider, single_flight=single_flight,
+                timings=timings
+            ),
+            expires_at
+        ))
+        return snapshot
+    
+    # Sessions that miss the cache together share one inline scan; only the
+    # session running it sees rows stream in
+    expires_at = fresh_until().timestamp()
+    return single_flight.do(key, lambda: publish(
+        analyze_stocks(
+            list(tickers), period=period, store=store, provider=provider, single_flight=single_flight,
+            timings=timings, on_rows=on_rows
+        ),
+        expires_at
+    ))
+
+def load_price_history(ticker, period=CHART_PERIOD):
+    """
+    Load bars for a single ticker on demand (for charting), reading the
+    price store first and fetching from the provider when the stored
+    history is shorter than the chart period
+    """
+    stored = get_price_store().read(ticker)
+    if covers_period(stored, period):
+        return trim_to_period(stored, period)
+    return fetch_stock_data(ticker, period, get_price_store(), get_data_provider(), get_single_flight())
 
 def plot_stock(ticker, data):
     """
     Create an interactive plot for a stock showing price and 30-day low
     """
+    # Deferred so reruns that never draw a chart skip Plotly's import cost
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
     try:
         # Check if data is valid
         if data is None or data.empty or len(data) < 30:
@@ -245,7 +292,7 @@ def plot_stock(ticker, data):
         )
         
         # 30-day low line
-        low_30d = data['Low'].rolling(window=30).min()
+        low_30d = indicator_series(data)['low_30d']
         fig.add_trace(
             go.Scatter(
                 x=data.index,
@@ -291,7 +338,51 @@ def plot_stock(ticker, data):
         st.error(f"Error creating plot for {ticker}: {str(e)}")
         return None
 
+def render_failures(failures):
+    """
+    Collapsible report of the tickers a scan dropped, counted by reason
+    """
+    with st.expander(f"⚠️ {len(failures)} stocks dropped from this scan"):
+        counts = failure_counts(failures)
+        columns = st.columns(len(counts))
+        for column, (reason, count) in zip(columns, counts.items()):
+            with column:
+                st.metric(reason.replace('_', ' ').capitalize(), count)
+        
+        st.dataframe(
+            pd.DataFrame({'Ticker': list(failures), 'Reason': list(failures.values())}),
+            use_container_width=True,
+            hide_index=True
+        )
+
+def render_performance_panel(timings):
+    """
+    Collapsible sidebar panel with p50/p95/max per stage and the slowest tickers
+    """
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        summary = timings.summary()
+        if summary.empty:
+            st.caption("No timings recorded yet.")
+            return
+        
+        st.dataframe(summary.round(1), use_container_width=True)
+        slowest = timings.slowest_tickers()
+        if slowest.empty:
+            st.caption("No tickers fetched yet.")
+        else:
+            st.caption("Slowest tickers (time until the request carrying each ticker finished; batch = tickers in it)")
+            st.dataframe(slowest, use_container_width=True, hide_index=True)
+
 def main():
+    configure_page()
+    timings = get_timings()
+    try:
+        with timings.span('page'):
+            render_page(timings)
+    finally:
+        render_performance_panel(timings)
+
+def render_page(timings):
     # Header
     st.markdown('<h1 class="main-header">📈 S&P 500 Demand Zone Analyzer</h1>', unsafe_allow_html=True)
     
@@ -303,7 +394,7 @@ def main():
         "RSI Threshold",
         min_value=10,
         max_value=50,
-        value=40,
+        value=DEFAULT_RSI_THRESHOLD,
         help="Stocks with RSI below this value are considered oversold"
     )
     
@@ -311,7 +402,7 @@ def main():
         "Distance from Low (%)",
         min_value=1,
         max_value=15,
-        value=5,
+        value=DEFAULT_DISTANCE_THRESHOLD,
         help="Maximum percentage above 30-day low to be in demand zone"
     )
     
@@ -319,7 +410,7 @@ def main():
         "Volume Threshold",
         min_value=100000,
         max_value=10000000,
-        value=1000000,
+        value=DEFAULT_VOLUME_THRESHOLD,
         step=100000,
         help="Minimum volume required for analysis"
     )
@@ -336,17 +427,21 @@ def main():
     # Refresh button
     if st.sidebar.button("🔄 Refresh Analysis", type="primary"):
         st.cache_data.clear()
+        get_result_cache().clear()
+        get_snapshot_store().clear()
         st.rerun()
     
     # Fetch tickers
-    tickers = fetch_sp500_tickers()
+    with timings.span('universe'):
+        tickers = fetch_sp500_tickers()
     
     if not tickers:
         st.error("❌ Failed to fetch ticker symbols. Please try again.")
         return
     
-    # Limit to top N stocks
-    tickers = tickers[:top_n]
+    # Limit to the top N stocks by market cap
+    with timings.span('select_top_n'):
+        tickers = select_top_tickers(tickers, top_n)
     
     # Display current parameters
     col1, col2, col3, col4 = st.columns(4)
@@ -359,35 +454,73 @@ def main():
     with col4:
         st.metric("Stocks to Analyze", len(tickers))
     
-    # Analyze stocks
-    results = analyze_stocks(tickers, rsi_threshold, distance_threshold, volume_threshold)
+    # Stream partial results while a scan runs
+    live_results = st.empty()
     
-    if not results:
+    def render_partial(rows):
+        partial = screen_stocks(pd.DataFrame(rows), rsi_threshold, distance_threshold, volume_threshold)
+        in_zone = partial[partial['In_Demand_Zone']]
+        with live_results.container():
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Stocks Analyzed So Far", len(partial))
+            with col2:
+                st.metric("In Demand Zone So Far", len(in_zone))
+            st.dataframe(
+                in_zone[['Ticker', 'Weekly_%', 'Monthly_%', 'RSI', 'Distance_from_Low_%', 'Volume', 'Close']],
+                use_container_width=True,
+                hide_index=True
+            )
+    
+    # Analyze stocks (cached per universe; thresholds only re-screen)
+    with timings.span('scan', tickers=len(tickers)):
+        indicator_table = load_indicator_table(tuple(tickers), on_rows=render_partial)
+    live_results.empty()
+    
+    if indicator_table.empty:
         st.warning("⚠️ No stock data could be fetched. Please check your internet connection and try again.")
         return
     
-    # Create DataFrame
-    df_results = pd.DataFrame(results)
+    as_of = indicator_table.attrs.get('as_of')
+    if as_of is not None:
+        st.caption(f"📅 Market data as of {as_of:%Y-%m-%d %H:%M %Z}")
+    refresh_error = get_snapshot_store().last_error(tuple(tickers))
+    if get_snapshot_store().is_refreshing(tuple(tickers)):
+        st.caption("🔄 Refreshing in the background; rerun to see newer data once it completes.")
+    elif refresh_error is not None:
+        st.caption(f"⚠️ The last background refresh failed: {refresh_error}")
+    for job, label in (("sp500-constituents", "constituent list"), ("metadata-index", "market cap index")):
+        job_error = get_background_jobs().last_error(job)
+        if job_error is not None:
+            st.caption(f"⚠️ The last {label} update failed: {job_error}")
     
-    # Check if DataFrame is empty or missing required columns
-    if df_results.empty:
-        st.warning("⚠️ No stock data could be processed. Please try again.")
-        return
+    if indicator_table.attrs.get('incomplete'):
+        unfetched = indicator_table.attrs.get('unfetched', [])
+        st.warning(f"⚠️ Partial results: {len(unfetched)} stocks did not respond in time and were skipped.")
+    
+    failures = indicator_table.attrs.get('failures', {})
+    if failures:
+        render_failures(failures)
     
     # Define required columns
-    required_columns = ['Ticker', 'Weekly_%', 'Monthly_%', 'RSI', 'Distance_from_Low_%', 'Volume', 'Close', 'In_Demand_Zone']
+    required_columns = ['Ticker', 'Weekly_%', 'Monthly_%', 'RSI', 'Distance_from_Low_%', 'Volume', 'Close']
     
     # Check if all required columns exist
-    missing_columns = [col for col in required_columns if col not in df_results.columns]
+    missing_columns = [col for col in required_columns if col not in indicator_table.columns]
     if missing_columns:
         st.error(f"❌ Missing required columns: {missing_columns}. Please try refreshing the analysis.")
         return
     
+    # Apply thresholds
+    with timings.span('screen'):
+        df_results = screen_stocks(indicator_table, rsi_threshold, distance_threshold, volume_threshold)
+    
     # Separate demand zone and other stocks
     demand_zone_stocks = df_results[df_results['In_Demand_Zone'] == True]
     other_stocks = df_results[df_results['In_Demand_Zone'] == False]
     
     # Display results
+    render_start = time.perf_counter()
     st.header("📊 Analysis Results")
     
     # Summary metrics
@@ -442,11 +575,14 @@ def main():
                 top_stock = demand_zone_stocks.iloc[0]
                 st.subheader(f"📈 Chart: {top_stock['Ticker']} (Top Demand Zone Stock)")
                 
-                if 'data' in top_stock:
-                    fig = plot_stock(top_stock['Ticker'], top_stock['data'])
+                with timings.span('chart_data', ticker=top_stock['Ticker']):
+                    chart_data = load_price_history(top_stock['Ticker'])
+                if chart_data is not None:
+                    with timings.span('chart', ticker=top_stock['Ticker']):
+                        fig = plot_stock(top_stock['Ticker'], chart_data)
+                        if fig:
+                            st.plotly_chart(fig, use_container_width=True)
                     if fig:
-                        st.plotly_chart(fig, use_container_width=True)
-                        
                         # Display stock details
                         col1, col2, col3, col4 = st.columns(4)
                         with col1:
@@ -498,6 +634,8 @@ def main():
         except Exception as e:
             st.error(f"❌ Error displaying all stocks: {str(e)}")
     
+    timings.record('render', time.perf_counter() - render_start)
+    
     # Footer
     st.markdown("---")
     st.markdown(
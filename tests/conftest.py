@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from demand_zone.providers import MarketDataProvider, SyntheticProvider
+
+# Fixed last bar so synthetic data is identical on every run
+SYNTHETIC_END = pd.Timestamp('2026-10-16')
+
+
+class RecordingProvider(MarketDataProvider):
+    """
+    Wraps another provider and records the arguments of every fetch_bars call
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.calls = []
+
+    def fetch_universe(self):
+        return self.provider.fetch_universe()
+
+    def fetch_bars(self, tickers, period=None, start=None):
+        self.calls.append({'tickers': list(tickers), 'period': period, 'start': start})
+        return self.provider.fetch_bars(tickers, period=period, start=start)
+
+    def fetch_metadata(self, tickers):
+        return self.provider.fetch_metadata(tickers)
+
+
+class OmittingProvider(RecordingProvider):
+    """
+    Leaves some tickers out of every response, like yf.download does for
+    symbols it failed on
+    """
+
+    def __init__(self, provider, omitted):
+        super().__init__(provider)
+        self.omitted = set(omitted)
+
+    def fetch_bars(self, tickers, period=None, start=None):
+        bars = super().fetch_bars(tickers, period=period, start=start)
+        return {ticker: data for ticker, data in bars.items() if ticker not in self.omitted}
+
+
+@pytest.fixture
+def synthetic():
+    return SyntheticProvider(n_tickers=120, n_bars=120, end=SYNTHETIC_END)
+
+
+@pytest.fixture
+def recording(synthetic):
+    return RecordingProvider(synthetic)
+
+
+@pytest.fixture
+def omitting(synthetic):
+    return lambda omitted: OmittingProvider(synthetic, omitted)
+
+
+class UnreachableProvider(RecordingProvider):
+    """
+    Every bar request fails as if the upstream were down
+    """
+
+    def fetch_bars(self, tickers, period=None, start=None):
+        super().fetch_bars(tickers, period=period, start=start)
+        raise ConnectionError("upstream unreachable")
+
+
+@pytest.fixture
+def unreachable(synthetic):
+    return UnreachableProvider(synthetic)
@@ -0,0 +1,149 @@
+import os
+
+import pandas as pd
+import pytest
+
+from demand_zone.providers import LocalProvider, generate_ohlcv, split_batch_frame
+from demand_zone.scan import chunk_tickers, download_stock_data, download_stock_data_batch
+from demand_zone.store import OHLCVStore
+
+END = pd.Timestamp('2026-10-16')
+
+
+def combined_frame(frames):
+    # Same layout as yf.download(group_by='ticker'): ticker on the outer column level
+    return pd.concat(frames, axis=1)
+
+
+def test_chunk_tickers_keeps_order_and_remainder():
+    tickers = [f"T{i}" for i in range(7)]
+
+    chunks = chunk_tickers(tickers, 3)
+
+    assert chunks == [['T0', 'T1', 'T2'], ['T3', 'T4', 'T5'], ['T6']]
+    assert chunk_tickers(tickers, 50) == [tickers]
+    assert chunk_tickers([], 3) == []
+
+
+def test_split_batch_frame_returns_one_frame_per_ticker():
+    frames = {ticker: generate_ohlcv(ticker, 40, END) for ticker in ['AAA', 'BBB']}
+
+    split = split_batch_frame(combined_frame(frames), ['AAA', 'BBB'])
+
+    assert set(split) == {'AAA', 'BBB'}
+    for ticker, data in split.items():
+        pd.testing.assert_frame_equal(data, frames[ticker], check_names=False)
+
+
+def test_split_batch_frame_drops_padding_missing_and_short_tickers():
+    frames = {
+        'LONG': generate_ohlcv('LONG', 40, END),
+        'SHORT': generate_ohlcv('SHORT', 35, END),
+        'TINY': generate_ohlcv('TINY', 10, END),
+    }
+
+    split = split_batch_frame(combined_frame(frames), ['LONG', 'SHORT', 'TINY', 'GONE'])
+
+    assert set(split) == {'LONG', 'SHORT'}
+    # SHORT is NaN-padded on the shared index; only its own bars come back
+    assert len(split['SHORT']) == 35
+    assert not split['SHORT'].isna().any().any()
+
+
+def test_split_batch_frame_handles_single_ticker_without_column_level():
+    data = generate_ohlcv('AAA', 40, END)
+
+    assert list(split_batch_frame(data, ['AAA'])) == ['AAA']
+    assert split_batch_frame(data, ['AAA', 'BBB']) == {}
+    assert split_batch_frame(None, ['AAA']) == {}
+
+
+def test_batch_download_makes_one_request_per_chunk(recording):
+    tickers = recording.fetch_universe()
+
+    results = {}
+    for chunk in chunk_tickers(tickers, 50):
+        results.update(download_stock_data_batch(chunk, '3mo', None, recording))
+
+    assert len(recording.calls) == 3
+    assert [len(call['tickers']) for call in recording.calls] == [50, 50, 20]
+    assert set(results) == set(tickers)
+
+
+def test_batch_download_tops_up_stored_tickers_from_last_bar(tmp_path, recording):
+    store = OHLCVStore(tmp_path)
+    tickers = recording.fetch_universe()[:5]
+    download_stock_data_batch(tickers, '3mo', store, recording)
+
+    # Age the stored files so they are no longer fresh per the calendar
+    stale = pd.Timestamp('2020-01-02').timestamp()
+    for ticker in tickers:
+        os.utime(store.path(ticker), (stale, stale))
+
+    recording.calls.clear()
+    results = download_stock_data_batch(tickers + ['NEW'], '3mo', store, recording)
+
+    full, incremental = recording.calls
+    assert full == {'tickers': ['NEW'], 'period': '3mo', 'start': None}
+    assert incremental['tickers'] == tickers
+    assert incremental['start'] == END.strftime('%Y-%m-%d')
+    assert set(results) == set(tickers) | {'NEW'}
+
+
+def test_batch_download_skips_fresh_stored_tickers(tmp_path, recording):
+    store = OHLCVStore(tmp_path)
+    tickers = recording.fetch_universe()[:5]
+    download_stock_data_batch(tickers, '3mo', store, recording)
+
+    recording.calls.clear()
+    results = download_stock_data_batch(tickers, '3mo', store, recording)
+
+    assert recording.calls == []
+    assert set(results) == set(tickers)
+
+
+def test_batch_download_from_local_fixtures(tmp_path):
+    for ticker in ['AAA', 'BBB']:
+        generate_ohlcv(ticker, 80, END).to_parquet(tmp_path / f"{ticker}.parquet")
+    generate_ohlcv('CCC', 10, END).to_csv(tmp_path / "CCC.csv")
+    provider = LocalProvider(tmp_path)
+
+    results = download_stock_data_batch(provider.fetch_universe(), '3mo', None, provider)
+
+    assert provider.fetch_universe() == ['AAA', 'BBB', 'CCC']
+    assert set(results) == {'AAA', 'BBB'}
+    assert all(data.index[-1] == END for data in results.values())
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 50])
+def test_batch_download_matches_per_ticker_bars(synthetic, chunk_size):
+    tickers = synthetic.fetch_universe()[:14]
+
+    results = {}
+    for chunk in chunk_tickers(tickers, chunk_size):
+        results.update(download_stock_data_batch(chunk, '3mo', None, synthetic))
+
+    for ticker in tickers:
+        pd.testing.assert_frame_equal(results[ticker], synthetic.fetch_bars([ticker], period='3mo')[ticker])
+
+
+@pytest.mark.parametrize('batch', [True, False])
+def test_omitted_tickers_stay_stale(tmp_path, synthetic, omitting, batch):
+    store = OHLCVStore(tmp_path)
+    tickers = synthetic.fetch_universe()[:3]
+    download_stock_data_batch(tickers, '3mo', store, synthetic)
+
+    stale = pd.Timestamp('2020-01-02').timestamp()
+    for ticker in tickers:
+        os.utime(store.path(ticker), (stale, stale))
+
+    provider = omitting([tickers[1]])
+    if batch:
+        download_stock_data_batch(tickers, '3mo', store, provider)
+    else:
+        for ticker in tickers:
+            download_stock_data(ticker, '3mo', store, provider)
+
+    assert store.is_fresh(tickers[0])
+    assert not store.is_fresh(tickers[1])
+    assert store.is_fresh(tickers[2])
@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from demand_zone.cache import BackgroundJobs, ResultCache, SingleFlight, SnapshotStore, estimate_size
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr('demand_zone.cache.time.time', clock)
+    return clock
+
+
+def wait_for_refresh(store, key, timeout=2.0):
+    running = store.is_running if isinstance(store, BackgroundJobs) else store.is_refreshing
+    deadline = time.monotonic() + timeout
+    while running(key) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_failed_refresh_is_logged_and_kept(caplog):
+    store = SnapshotStore()
+
+    def compute():
+        raise RuntimeError("upstream down")
+
+    with caplog.at_level(logging.WARNING, logger="demand_zone.cache"):
+        assert store.refresh(('AAA', 'BBB'), compute)
+        wait_for_refresh(store, ('AAA', 'BBB'))
+
+    assert isinstance(store.last_error(('AAA', 'BBB')), RuntimeError)
+    assert '"event": "refresh_failed"' in caplog.text
+    assert "upstream down" in caplog.text
+    assert "2 tickers" in caplog.text
+
+
+def test_successful_refresh_clears_the_last_error():
+    store = SnapshotStore()
+    store.refresh('key', lambda: 1 / 0)
+    wait_for_refresh(store, 'key')
+
+    store.refresh('key', lambda: store.publish('key', 'value'))
+    wait_for_refresh(store, 'key')
+
+    assert store.last_error('key') is None
+    assert store.latest('key') == 'value'
+
+
+def test_background_jobs_run_one_at_a_time_per_key():
+    jobs = BackgroundJobs()
+    release = threading.Event()
+
+    assert jobs.run('metadata-index', lambda: release.wait(2))
+    assert not jobs.run('metadata-index', lambda: None)
+    assert jobs.run('sp500-constituents', lambda: 1 / 0)
+    release.set()
+    wait_for_refresh(jobs, 'metadata-index')
+    wait_for_refresh(jobs, 'sp500-constituents')
+
+    assert jobs.last_error('metadata-index') is None
+    assert isinstance(jobs.last_error('sp500-constituents'), ZeroDivisionError)
+
+
+def test_do_many_reports_errors_of_in_flight_owners():
+    flight = SingleFlight()
+    started = []
+
+    def owner(keys):
+        started.append(keys)
+        time.sleep(0.1)
+        raise ConnectionError("reset")
+
+    thread = threading.Thread(target=lambda: pytest.raises(ConnectionError, flight.do_many, ['A'], owner))
+    thread.start()
+    while not started:
+        time.sleep(0.005)
+
+    errors = {}
+    results = flight.do_many(['A', 'B'], lambda keys: {key: key.lower() for key in keys}, errors)
+    thread.join()
+
+    assert results == {'B': 'b'}
+    assert isinstance(errors['A'], ConnectionError)
+
+
+def test_result_cache_entries_expire_after_ttl(clock):
+    cache = ResultCache(ttl=60)
+    cache.put('a', 'value')
+    cache.put('b', 'value', expires_at=clock.now + 600)
+
+    clock.now += 59
+    assert cache.get('a') == 'value'
+
+    clock.now += 1
+    assert cache.get('a') is None
+    assert cache.get('b') == 'value'
+    assert len(cache) == 1
+    assert cache.size_bytes == estimate_size('value')
+
+
+def test_result_cache_evicts_least_recently_used_first(clock):
+    size = estimate_size('x' * 100)
+    cache = ResultCache(max_bytes=3 * size)
+    for key in 'abc':
+        cache.put(key, key * 100)
+
+    # Reading 'a' makes 'b' the least recently used entry
+    assert cache.get('a') == 'a' * 100
+    cache.put('d', 'd' * 100)
+
+    assert cache.get('b') is None
+    assert [cache.get(key) is not None for key in 'acd'] == [True, True, True]
+    assert cache.size_bytes == 3 * size
+
+
+def test_result_cache_drops_values_larger_than_max_bytes(clock):
+    cache = ResultCache(max_bytes=estimate_size('x' * 100))
+    cache.put('big', 'small')
+    cache.put('big', 'x' * 1000)
+
+    assert cache.get('big') is None
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(2)
+        return 'table'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do('key', compute))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while not calls:
+        time.sleep(0.005)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ['table'] * 4
@@ -0,0 +1,56 @@
+import json
+
+import pandas as pd
+import pytest
+import requests
+
+from demand_zone import cli
+from demand_zone.constituents import FALLBACK_TICKERS
+from demand_zone.providers import SyntheticProvider
+
+
+class OfflineProvider(SyntheticProvider):
+    """
+    Synthetic bars with an unreachable constituent source and an optional
+    stored snapshot
+    """
+
+    def __init__(self, snapshot=None, **options):
+        super().__init__(**options)
+        self.snapshot = snapshot
+
+    def fetch_universe(self):
+        raise requests.ConnectionError("Wikipedia is unreachable")
+
+    def stored_universe(self):
+        return self.snapshot
+
+
+def snapshot(tickers, age):
+    return {'tickers': tickers, 'fetched_at': (pd.Timestamp.now(tz='UTC') - age).isoformat()}
+
+
+@pytest.mark.parametrize('age', [pd.Timedelta(hours=1), pd.Timedelta(days=3)])
+def test_universe_falls_back_to_stored_snapshot(age, capsys):
+    provider = OfflineProvider(snapshot(['SYN00001', 'SYN00002'], age))
+
+    assert cli.load_universe(provider) == ['SYN00001', 'SYN00002']
+
+
+def test_universe_falls_back_to_major_stocks_without_snapshot(capsys):
+    assert cli.load_universe(OfflineProvider()) == FALLBACK_TICKERS
+    assert "failed to fetch ticker list" in capsys.readouterr().err
+
+
+def test_main_screens_stored_universe_when_offline(monkeypatch, capsys):
+    provider = OfflineProvider(snapshot(['SYN00001', 'SYN00002', 'SYN00003'], pd.Timedelta(days=3)))
+    monkeypatch.setattr(cli, 'provider_from_env', lambda: provider)
+
+    assert cli.main(['--no-store', '--format', 'json']) == 0
+
+    rows = json.loads(capsys.readouterr().out)
+    assert sorted(row['Ticker'] for row in rows) == ['SYN00001', 'SYN00002', 'SYN00003']
+
+
+def test_parquet_output_needs_a_path(capsys):
+    assert cli.main(['--format', 'parquet']) == 2
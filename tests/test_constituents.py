@@ -0,0 +1,45 @@
+import pytest
+
+from demand_zone.constituents import ConstituentStore, parse_constituent_symbols
+
+PAGE = """
+<html><body>
+<table class="wikitable"><tr><th>Other</th></tr><tr><td>NOPE</td></tr></table>
+<table class="wikitable sortable" id="constituents">
+<tr><th>Symbol</th><th>Security</th></tr>
+<tr><td><a href="#">MMM</a></td><td>3M</td></tr>
+<tr><td><a href="#">BRK.B</a></td><td>Berkshire Hathaway</td></tr>
+</table>
+<table id="changes"><tr><td>OLD</td></tr></table>
+</body></html>
+"""
+
+
+def test_parse_reads_only_the_constituents_table():
+    assert parse_constituent_symbols(PAGE) == ['MMM', 'BRK-B']
+
+
+def test_parse_rejects_pages_without_a_table():
+    with pytest.raises(ValueError):
+        parse_constituent_symbols("<html></html>")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = ConstituentStore(tmp_path / "constituents.json")
+    snapshot = {'tickers': ['MMM'], 'etag': '"abc"', 'last_modified': None, 'fetched_at': '2026-10-16T00:00:00+00:00'}
+
+    store.save(snapshot)
+
+    assert store.load() == snapshot
+    assert list(tmp_path.iterdir()) == [store.path]
+
+
+def test_failed_save_keeps_previous_snapshot_and_no_temp_file(tmp_path):
+    store = ConstituentStore(tmp_path / "constituents.json")
+    store.save({'tickers': ['MMM']})
+
+    with pytest.raises(TypeError):
+        store.save({'tickers': ['MMM'], 'fetched_at': object()})
+
+    assert store.load() == {'tickers': ['MMM']}
+    assert list(tmp_path.iterdir()) == [store.path]
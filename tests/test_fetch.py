@@ -0,0 +1,67 @@
+import time
+
+from demand_zone.fetch import fetch_chunks_async, fetch_chunks_threaded, iter_fetch_chunks
+
+
+def sleeping_fetch(delays):
+    def fetch(chunk):
+        time.sleep(delays[chunk[0]])
+        return {ticker: ticker.lower() for ticker in chunk}
+    return fetch
+
+
+def test_timed_out_requests_do_not_starve_queued_chunks():
+    delays = {'S0': 0.6, 'S1': 0.6, **{f"F{i}": 0.02 for i in range(10)}}
+    chunks = [[ticker] for ticker in delays]
+
+    result = fetch_chunks_async(chunks, sleeping_fetch(delays), concurrency=2, request_timeout=0.2, deadline=None)
+
+    assert sorted(result.timed_out) == ['S0', 'S1']
+    assert sorted(result.bars) == sorted(f"F{i}" for i in range(10))
+    assert not result.missed_deadline
+
+
+def test_deadline_abandons_outstanding_chunks():
+    delays = {'A': 0.01, 'B': 1.0, 'C': 1.0}
+    chunks = [['A'], ['B'], ['C']]
+
+    start = time.perf_counter()
+    result = fetch_chunks_async(chunks, sleeping_fetch(delays), concurrency=3, request_timeout=5, deadline=0.2)
+
+    assert time.perf_counter() - start < 0.9
+    assert list(result.bars) == ['A']
+    assert sorted(result.missed_deadline) == ['B', 'C']
+    assert result.incomplete
+
+
+def test_errors_are_recorded_per_chunk():
+    def fetch(chunk):
+        if chunk[0] == 'BAD':
+            raise ValueError("boom")
+        return {ticker: ticker for ticker in chunk}
+
+    for result in (
+        fetch_chunks_async([['OK'], ['BAD']], fetch, deadline=None),
+        fetch_chunks_threaded([['OK'], ['BAD']], fetch),
+    ):
+        assert list(result.bars) == ['OK']
+        assert result.failed == ['BAD']
+        assert isinstance(result.errors['BAD'], ValueError)
+        assert not result.incomplete
+
+
+def test_iter_fetch_chunks_yields_progress_and_returns_result():
+    delays = {ticker: 0.01 for ticker in 'ABCD'}
+    stream = iter_fetch_chunks([['A', 'B'], ['C', 'D']], sleeping_fetch(delays), concurrency=2)
+
+    seen = []
+    while True:
+        try:
+            chunk, bars = next(stream)
+        except StopIteration as done:
+            result = done.value
+            break
+        seen.extend(bars)
+
+    assert sorted(seen) == ['A', 'B', 'C', 'D']
+    assert sorted(result.bars) == ['A', 'B', 'C', 'D']
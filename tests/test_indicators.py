@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from demand_zone.indicators import (
+    INDICATOR_COLUMNS, MIN_BARS, IndicatorState, build_panel, compute_indicator_panel, compute_rsi, indicator_series,
+    required_bars, rsi_last, rsi_panel
+)
+from demand_zone.providers import generate_ohlcv
+from demand_zone.scan import calculate_indicators, screening_period
+from demand_zone.store import trim_to_period
+
+END = pd.Timestamp('2026-10-16')
+
+
+def universe(lengths, missing_rate=0.0):
+    return {
+        f"T{i}": generate_ohlcv(f"T{i}", n_bars, END, missing_rate=missing_rate)
+        for i, n_bars in enumerate(lengths)
+    }
+
+
+@pytest.mark.parametrize('lengths', [
+    [required_bars()] * 8,
+    [MIN_BARS, 35, required_bars(), 63, 252],
+])
+@pytest.mark.parametrize('missing_rate', [0.0, 0.05])
+def test_latest_only_matches_full_series_panel(lengths, missing_rate):
+    bars = universe(lengths, missing_rate)
+
+    latest = compute_indicator_panel(bars, latest_only=True)
+    full = compute_indicator_panel(bars, latest_only=False)
+
+    pd.testing.assert_frame_equal(latest, full, rtol=1e-12)
+    assert list(latest.columns) == INDICATOR_COLUMNS
+
+
+def test_latest_only_matches_indicator_series():
+    bars = universe([MIN_BARS, 47, 63, 252])
+
+    latest = compute_indicator_panel(bars, latest_only=True)
+
+    for ticker, data in bars.items():
+        series = indicator_series(data).iloc[-1]
+        for column in ['rsi', 'low_30d', 'distance_from_low', 'weekly_change', 'monthly_change']:
+            assert latest.loc[ticker, column] == pytest.approx(series[column], rel=1e-12)
+
+
+def test_latest_only_matches_per_ticker_indicators():
+    bars = universe([47, 63, 252])
+
+    latest = compute_indicator_panel(bars, latest_only=True)
+
+    for ticker, data in bars.items():
+        indicators = calculate_indicators(data)
+        for column in INDICATOR_COLUMNS:
+            assert latest.loc[ticker, column] == pytest.approx(indicators[column], rel=1e-12)
+
+
+def test_rsi_last_matches_rsi_panel_with_padded_rows():
+    _, panel = build_panel(universe([20, 47, 120]), fields=('Close',))
+    close = panel['Close']
+
+    np.testing.assert_allclose(rsi_last(close), rsi_panel(close)[:, -1], rtol=1e-12)
+
+
+def test_rsi_panel_matches_1d_kernel():
+    close = generate_ohlcv('AAA', 120, END)['Close'].to_numpy()
+
+    np.testing.assert_allclose(compute_rsi(close[None, :])[0], compute_rsi(close), rtol=1e-12)
+
+
+def test_short_histories_are_dropped():
+    bars = universe([MIN_BARS - 1, 63])
+    bars['NONE'] = None
+
+    for latest_only in (True, False):
+        assert list(compute_indicator_panel(bars, latest_only=latest_only).index) == ['T1']
+    assert compute_indicator_panel({}).empty
+
+
+@pytest.mark.parametrize('missing_rate', [0.0, 0.05])
+def test_state_advanced_bar_by_bar_matches_panel(missing_rate):
+    full = generate_ohlcv('AAA', 252, END, missing_rate=missing_rate)
+    period = screening_period()
+    state = IndicatorState()
+
+    for end in range(MIN_BARS, len(full) + 1):
+        window = trim_to_period(full.iloc[:end], period)
+        # A forming bar is revised before the session closes
+        forming = window.copy()
+        forming.iloc[-1, forming.columns.get_loc('Close')] *= 1.01
+        state.advance(forming)
+
+        state = IndicatorState.from_dict(state.to_dict())
+        indicators = state.advance(window)
+        panel = compute_indicator_panel({'AAA': window})
+        if panel.empty:
+            continue
+        for column in INDICATOR_COLUMNS:
+            assert indicators[column] == pytest.approx(panel.loc['AAA', column], rel=1e-9)
+
+
+def test_state_replays_a_window_it_cannot_slide_onto():
+    full = generate_ohlcv('AAA', 252, END)
+    period = screening_period()
+    state = IndicatorState()
+    state.advance(trim_to_period(full, period))
+
+    # Going back in time rebuilds the state from the older window
+    window = trim_to_period(full.iloc[:150], period)
+    indicators = state.advance(window)
+
+    panel = compute_indicator_panel({'AAA': window})
+    for column in INDICATOR_COLUMNS:
+        assert indicators[column] == pytest.approx(panel.loc['AAA', column], rel=1e-9)
+
+
+@pytest.mark.parametrize('case', ['trending', 'flat', 'nan_gaps', 'missing_bars'])
+def test_compute_rsi_matches_ta(case):
+    ta_momentum = pytest.importorskip('ta.momentum')
+    close = generate_ohlcv('AAA', 120, END, missing_rate=0.05 if case == 'missing_bars' else 0.0)['Close']
+    if case == 'flat':
+        close = pd.Series(100.0, index=close.index)
+    elif case == 'nan_gaps':
+        close.iloc[[20, 21, 50, 80]] = np.nan
+
+    expected = ta_momentum.RSIIndicator(close, window=14).rsi().to_numpy()
+
+    np.testing.assert_allclose(compute_rsi(close.to_numpy()), expected, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(compute_rsi(close.to_numpy()[None, :])[0], expected, rtol=1e-12, equal_nan=True)
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+from demand_zone.market_calendar import MARKET_TZ, data_as_of, fresh_until, is_trading_day
+
+
+def et(value):
+    return pd.Timestamp(value, tz=MARKET_TZ)
+
+
+@pytest.mark.parametrize('now, expected', [
+    # Weekend and full-day holidays serve the previous session's close
+    ('2026-10-17 12:00', '2026-10-16 16:00'),
+    ('2026-11-26 12:00', '2026-11-25 16:00'),
+    ('2026-04-03 12:00', '2026-04-02 16:00'),
+    ('2026-07-03 12:00', '2026-07-02 16:00'),
+    # Before the open, inside the session, settling and after the close
+    ('2026-10-19 08:00', '2026-10-16 16:00'),
+    ('2026-10-19 09:30', '2026-10-19 09:30'),
+    ('2026-10-19 10:07', '2026-10-19 10:00'),
+    ('2026-10-19 16:10', '2026-10-19 16:00'),
+    ('2026-10-19 18:00', '2026-10-19 16:00'),
+    # Early closes: day after Thanksgiving, Christmas Eve, July 3
+    ('2026-11-27 12:59', '2026-11-27 12:45'),
+    ('2026-11-27 13:30', '2026-11-27 13:00'),
+    ('2026-12-24 14:00', '2026-12-24 13:00'),
+    ('2025-07-03 15:00', '2025-07-03 13:00'),
+    # Monday after the spring DST change still points at Friday's EST close
+    ('2026-03-09 08:00', '2026-03-06 16:00'),
+    # Juneteenth is a holiday only from 2022
+    ('2021-06-18 12:00', '2021-06-18 12:00'),
+    ('2022-06-20 12:00', '2022-06-17 16:00'),
+])
+def test_data_as_of(now, expected):
+    assert data_as_of(pd.Timestamp(now)) == et(expected)
+
+
+@pytest.mark.parametrize('fetched_at, expected', [
+    ('2026-10-17 12:00', '2026-10-19 09:30'),
+    ('2026-11-26 12:00', '2026-11-27 09:30'),
+    ('2026-04-02 17:00', '2026-04-06 09:30'),
+    ('2026-10-19 08:00', '2026-10-19 09:30'),
+    ('2026-10-19 10:07', '2026-10-19 10:22'),
+    # The closing bar can still be revised for SETTLE_PERIOD after the close
+    ('2026-10-19 16:10', '2026-10-19 16:25'),
+    ('2026-10-19 16:20', '2026-10-20 09:30'),
+    ('2026-10-19 18:00', '2026-10-20 09:30'),
+    ('2026-11-27 13:10', '2026-11-27 13:25'),
+    ('2026-11-27 13:20', '2026-11-30 09:30'),
+    ('2026-12-24 13:30', '2026-12-28 09:30'),
+    ('2025-07-03 13:30', '2025-07-07 09:30'),
+    ('2026-03-06 17:00', '2026-03-09 09:30'),
+    ('2026-10-30 17:00', '2026-11-02 09:30'),
+    ('2021-06-17 17:00', '2021-06-18 09:30'),
+    ('2022-06-17 17:00', '2022-06-21 09:30'),
+])
+def test_fresh_until(fetched_at, expected):
+    assert fresh_until(pd.Timestamp(fetched_at)) == et(expected)
+
+
+def test_next_open_across_dst_changes_keeps_wall_clock_time():
+    # 09:30 is 14:30 UTC before the spring change and 13:30 UTC after it
+    assert fresh_until(et('2026-03-06 17:00')) == pd.Timestamp('2026-03-09 13:30', tz='UTC')
+    assert fresh_until(et('2026-10-30 17:00')) == pd.Timestamp('2026-11-02 14:30', tz='UTC')
+
+
+def test_utc_times_are_converted_to_market_time():
+    # 21:00 UTC on a winter Friday is 16:00 in New York, right at the close
+    now = pd.Timestamp('2026-12-18 21:00', tz='UTC')
+
+    assert data_as_of(now) == et('2026-12-18 16:00')
+    assert fresh_until(now) == et('2026-12-18 16:15')
+
+
+@pytest.mark.parametrize('day, trading', [
+    ('2021-06-18', True),
+    ('2022-06-20', False),
+    ('2023-06-19', False),
+    ('2026-07-03', False),
+    ('2025-07-03', True),
+])
+def test_holiday_observance(day, trading):
+    assert is_trading_day(day) is trading
@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from demand_zone.metadata import MetadataIndex, top_by_market_cap
+from demand_zone.providers import METADATA_COLUMNS, RateLimitedProvider
+from demand_zone.ratelimit import ThrottledError
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+        self.throttled = 0
+
+    def acquire(self):
+        self.acquired += 1
+
+    def on_success(self):
+        pass
+
+    def on_throttle(self):
+        self.throttled += 1
+
+
+class ThrottlingProvider:
+    """
+    Serves synthetic metadata but throttles the listed tickers
+    """
+
+    def __init__(self, provider, throttled=()):
+        self.provider = provider
+        self.throttled = set(throttled)
+        self.requested = []
+
+    def fetch_metadata(self, tickers):
+        self.requested.extend(tickers)
+        if self.throttled.intersection(tickers):
+            raise ThrottledError("429 Too Many Requests")
+        return self.provider.fetch_metadata(tickers)
+
+
+def test_rate_limited_metadata_takes_a_token_per_ticker(synthetic):
+    limiter = CountingLimiter()
+    provider = RateLimitedProvider(ThrottlingProvider(synthetic), limiter, retries=0)
+    tickers = synthetic.fetch_universe()[:5]
+
+    metadata = provider.fetch_metadata(tickers)
+
+    assert limiter.acquired == 5
+    assert list(metadata.index) == tickers
+    assert list(metadata.columns) == METADATA_COLUMNS
+
+
+def test_throttled_metadata_reaches_the_limiter_and_pauses_refreshes(tmp_path, synthetic):
+    tickers = synthetic.fetch_universe()[:6]
+    limiter = CountingLimiter()
+    provider = RateLimitedProvider(ThrottlingProvider(synthetic, throttled=[tickers[4]]), limiter, retries=1)
+    index = MetadataIndex(tmp_path / "metadata.parquet")
+
+    with pytest.raises(ThrottledError):
+        index.refresh(provider, tickers, chunk_size=2)
+
+    assert limiter.throttled == 2
+    # Chunks before the throttled one are kept
+    assert sorted(index.read().index) == sorted(tickers[:4])
+    assert index.stale_tickers(tickers) == tickers[4:]
+    assert not index.refresh_due(tickers)
+    assert index.refresh_due(tickers, now=pd.Timestamp.now(tz='UTC') + index.retry_delay)
+
+
+def test_refresh_only_fetches_stale_tickers(tmp_path, synthetic):
+    tickers = synthetic.fetch_universe()[:4]
+    index = MetadataIndex(tmp_path / "metadata.parquet")
+    index.refresh(synthetic, tickers[:2])
+
+    provider = ThrottlingProvider(synthetic)
+    metadata = index.refresh(provider, tickers)
+
+    assert provider.requested == tickers[2:]
+    assert sorted(metadata.index) == sorted(tickers)
+    assert not index.refresh_due(tickers)
+
+
+def test_top_by_market_cap_ranks_unknown_caps_last_in_order():
+    metadata = pd.DataFrame({'market_cap': [10.0, 30.0, 20.0]}, index=['A', 'B', 'C'])
+
+    assert top_by_market_cap(['X', 'A', 'B', 'Y', 'C'], metadata, 2) == ['B', 'C']
+    assert top_by_market_cap(['X', 'A', 'B', 'Y', 'C'], metadata, 5) == ['B', 'C', 'A', 'X', 'Y']
+    assert top_by_market_cap(['A'], metadata, 0) == []
@@ -0,0 +1,128 @@
+import pytest
+
+from demand_zone.ratelimit import AdaptiveRateLimiter, ThrottledError, call_with_retry
+
+
+class FakeClock:
+    """
+    monotonic() and sleep() replacements; sleeping advances the clock
+    """
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr('demand_zone.ratelimit.time.monotonic', clock.monotonic)
+    monkeypatch.setattr('demand_zone.ratelimit.time.sleep', clock.sleep)
+    return clock
+
+
+def test_burst_is_served_without_waiting(clock):
+    limiter = AdaptiveRateLimiter(rate=5.0, burst=3)
+
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+    # The bucket is empty; the next token takes 1 / rate seconds to refill
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(0.2)]
+
+
+def test_tokens_refill_at_rate_up_to_burst(clock):
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=4)
+    for _ in range(4):
+        limiter.acquire()
+
+    clock.now += 1.0
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == []
+
+    # A long idle period refills no more than the burst
+    clock.now += 60
+    for _ in range(4):
+        limiter.acquire()
+    assert clock.sleeps == []
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_rate_increases_additively_up_to_max(clock):
+    limiter = AdaptiveRateLimiter(rate=5.0, max_rate=5.25, increase=0.1)
+
+    limiter.on_success()
+    assert limiter.rate == pytest.approx(5.1)
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 5.25
+
+
+def test_throttle_halves_rate_down_to_min_and_drains_bucket(clock):
+    limiter = AdaptiveRateLimiter(rate=4.0, burst=10, min_rate=1.5, decrease=0.5)
+
+    limiter.on_throttle()
+    assert limiter.rate == 2.0
+    limiter.on_throttle()
+    assert limiter.rate == 1.5
+
+    # No burst left after a throttle: the next request waits a full token
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(1 / 1.5)]
+
+
+def test_transient_errors_are_retried_with_backoff(clock, monkeypatch):
+    # Full jitter picks the top of each backoff window
+    monkeypatch.setattr('demand_zone.ratelimit.random.uniform', lambda low, high: high)
+    limiter = AdaptiveRateLimiter(rate=4.0, burst=10)
+    outcomes = [ThrottledError("429"), ConnectionError("reset"), 'bars']
+
+    def func():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert call_with_retry(func, limiter, retries=3, base_delay=0.5) == 'bars'
+    assert clock.sleeps == [0.5, 1.0]
+    assert limiter.rate == pytest.approx(2.0 + 0.1)
+
+
+def test_retries_are_bounded(clock):
+    calls = []
+
+    def func():
+        calls.append(1)
+        raise TimeoutError("slow")
+
+    with pytest.raises(TimeoutError):
+        call_with_retry(func, retries=2)
+    assert len(calls) == 3
+    assert len(clock.sleeps) == 2
+
+
+@pytest.mark.parametrize('error', [ValueError("bad ticker"), KeyError('Close'), PermissionError("denied")])
+def test_non_transient_errors_are_never_retried(clock, error):
+    limiter = AdaptiveRateLimiter(rate=4.0)
+    calls = []
+
+    def func():
+        calls.append(1)
+        raise error
+
+    with pytest.raises(type(error)):
+        call_with_retry(func, limiter, retries=3)
+    assert len(calls) == 1
+    assert clock.sleeps == []
+    assert limiter.rate == 4.0
@@ -0,0 +1,135 @@
+import logging
+import time
+
+import pandas as pd
+import pytest
+
+from demand_zone.failures import failure_counts
+from demand_zone.providers import MarketDataProvider
+from demand_zone.ratelimit import ThrottledError
+from demand_zone.scan import BATCH_CHUNK_SIZE, calculate_indicators, scan_stocks, streaming_chunk_size
+from demand_zone.store import OHLCVStore
+from demand_zone.timing import Timings
+
+
+class FaultyProvider(MarketDataProvider):
+    """
+    Serves AAA's bars under special ticker names that each fail one way
+    """
+
+    def __init__(self, provider, slow_seconds):
+        self.provider = provider
+        self.slow_seconds = slow_seconds
+
+    def fetch_universe(self):
+        return self.provider.fetch_universe()
+
+    def fetch_bars(self, tickers, period=None, start=None):
+        bars = {}
+        for ticker in tickers:
+            if ticker == 'THROTTLED':
+                raise ThrottledError("429 Too Many Requests")
+            if ticker.startswith('SLOW'):
+                time.sleep(self.slow_seconds)
+            if ticker == 'EMPTY':
+                continue
+            source = ticker if ticker in self.provider.fetch_universe() else 'AAA'
+            data = self.provider.fetch_bars([source], period=period, start=start)[source]
+            bars[ticker] = data.iloc[-10:] if ticker == 'SHORT' else data
+        return bars
+
+    def fetch_metadata(self, tickers):
+        return self.provider.fetch_metadata(tickers)
+
+
+@pytest.mark.parametrize('n_tickers, max_workers, expected', [
+    (25, 10, 3),
+    (100, 10, 10),
+    (5, 10, 1),
+    (5000, 10, BATCH_CHUNK_SIZE),
+])
+def test_streaming_chunk_size(n_tickers, max_workers, expected):
+    assert streaming_chunk_size(n_tickers, max_workers) == expected
+
+
+def test_rows_stream_in_several_chunks(recording):
+    tickers = recording.fetch_universe()[:25]
+    partial_sizes = []
+
+    table = scan_stocks(tickers, provider=recording, on_rows=lambda rows: partial_sizes.append(len(rows)))
+
+    assert len(recording.calls) == 9
+    assert len(partial_sizes) == 9
+    assert partial_sizes == sorted(partial_sizes)
+    assert partial_sizes[-1] == len(table) == 25
+
+
+def test_scan_without_callbacks_keeps_batch_chunks(recording):
+    tickers = recording.fetch_universe()[:25]
+
+    table = scan_stocks(tickers, provider=recording)
+
+    assert len(recording.calls) == 1
+    assert len(table) == 25
+    assert isinstance(table.attrs['as_of'], pd.Timestamp)
+
+
+@pytest.mark.parametrize('streaming', [True, False])
+def test_default_chunking_fills_ticker_latencies(synthetic, streaming):
+    tickers = synthetic.fetch_universe()[:100]
+    timings = Timings()
+    on_rows = (lambda rows: None) if streaming else None
+
+    scan_stocks(tickers, provider=synthetic, timings=timings, on_rows=on_rows)
+
+    batch = 10 if streaming else BATCH_CHUNK_SIZE
+    slowest = timings.slowest_tickers(n=len(tickers))
+    assert timings.summary().loc['fetch', 'count'] == len(tickers) // batch
+    assert sorted(slowest['Ticker']) == sorted(tickers)
+    assert (slowest['batch'] == batch).all()
+    assert (slowest['ms'] > 0).all()
+
+
+def test_indicator_errors_are_logged_with_the_ticker(synthetic, caplog):
+    data = synthetic.fetch_bars(['AAA'], period='3mo')['AAA'].drop(columns=['Low'])
+
+    with caplog.at_level(logging.WARNING, logger="demand_zone.scan"):
+        assert calculate_indicators(data, 'AAA') is None
+
+    assert '"ticker": "AAA"' in caplog.text
+    assert "KeyError" in caplog.text
+
+
+def test_store_backed_scan_matches_panel_scan(tmp_path, synthetic):
+    tickers = synthetic.fetch_universe()[:20]
+    store = OHLCVStore(tmp_path)
+
+    expected = scan_stocks(tickers, provider=synthetic)
+    first = scan_stocks(tickers, provider=synthetic, store=store)
+    resumed = scan_stocks(tickers, provider=synthetic, store=store)
+
+    assert all(store.load_state(ticker) is not None for ticker in tickers)
+    pd.testing.assert_frame_equal(first, expected, check_exact=False, rtol=1e-9)
+    pd.testing.assert_frame_equal(resumed, expected, check_exact=False, rtol=1e-9)
+
+
+def test_scan_reports_every_failure_reason(synthetic):
+    good = synthetic.fetch_universe()[:4]
+    # Two slow requests time out and hold both worker slots past the
+    # deadline, so the last two tickers never start
+    tickers = good + ['EMPTY', 'SHORT', 'THROTTLED', 'SLOW1', 'SLOW2', 'LATE1', 'LATE2']
+    provider = FaultyProvider(synthetic, slow_seconds=0.6)
+
+    table = scan_stocks(
+        tickers, provider=provider, chunk_size=1, max_workers=2, request_timeout=0.1, deadline=0.35
+    )
+
+    failures = table.attrs['failures']
+    assert failure_counts(failures) == {
+        'timeout': 2, 'missed_deadline': 2, 'throttled': 1, 'empty_data': 1, 'insufficient_bars': 1
+    }
+    assert failures['SLOW1'] == failures['SLOW2'] == 'timeout'
+    assert failures['LATE1'] == failures['LATE2'] == 'missed_deadline'
+    assert sorted(table['Ticker']) == sorted(good)
+    assert table.attrs['incomplete']
+    assert sorted(table.attrs['unfetched']) == ['LATE1', 'LATE2', 'SLOW1', 'SLOW2']
@@ -0,0 +1,69 @@
+import os
+
+import pandas as pd
+import pytest
+
+from demand_zone.failures import FailureReport
+from demand_zone.scan import download_stock_data, download_stock_data_batch
+from demand_zone.store import OHLCVStore, covers_period, trim_to_period
+
+STALE = pd.Timestamp('2020-01-02').timestamp()
+
+
+@pytest.fixture
+def stale_store(tmp_path, synthetic):
+    """
+    A store holding 3mo of bars for five tickers, too old to count as fresh
+    """
+    store = OHLCVStore(tmp_path)
+    tickers = synthetic.fetch_universe()[:5]
+    download_stock_data_batch(tickers, '3mo', store, synthetic)
+    for ticker in tickers:
+        os.utime(store.path(ticker), (STALE, STALE))
+    return store, tickers
+
+
+def test_append_replaces_overlapping_bars(tmp_path, synthetic):
+    store = OHLCVStore(tmp_path)
+    bars = synthetic.fetch_bars(['AAA'], period='3mo')['AAA']
+    store.append('AAA', bars.iloc[:-5])
+
+    revised = bars.iloc[-6:].copy()
+    revised['Close'] += 1
+    combined = store.append('AAA', revised)
+
+    assert len(combined) == len(bars)
+    assert combined['Close'].iloc[-1] == bars['Close'].iloc[-1] + 1
+    pd.testing.assert_frame_equal(store.read('AAA'), combined, check_freq=False)
+
+
+def test_covers_and_trim_period(synthetic):
+    bars = synthetic.fetch_bars(['AAA'])['AAA']
+
+    assert covers_period(bars, '3mo')
+    assert not covers_period(trim_to_period(bars, '1mo'), '3mo')
+    assert not covers_period(None, '3mo')
+
+
+def test_stored_bars_are_served_when_upstream_is_unreachable(stale_store, unreachable):
+    store, tickers = stale_store
+    failures = FailureReport()
+
+    data = download_stock_data(tickers[0], '3mo', store, unreachable, failures)
+
+    assert len(unreachable.calls) == 1
+    pd.testing.assert_frame_equal(data, trim_to_period(store.read(tickers[0]), '3mo'))
+    assert len(failures) == 0
+    assert not store.is_fresh(tickers[0])
+
+
+def test_batch_serves_stored_bars_when_upstream_is_unreachable(stale_store, unreachable):
+    store, tickers = stale_store
+    failures = FailureReport()
+
+    results = download_stock_data_batch(tickers, '3mo', store, unreachable, failures)
+
+    assert len(unreachable.calls) == 1
+    assert set(results) == set(tickers)
+    assert len(failures) == 0
+    assert not any(store.is_fresh(ticker) for ticker in tickers)